@@ -0,0 +1,116 @@
+"""Volatility-driven poll intervals for Systemair SAVE VSR.
+
+Learns from every sweep how fast each register-backed key moves (an
+exponentially weighted rate of change plus the spread of its steps) and
+polls each batch just often enough to see its fastest key move by a
+resolution step: a couple of raw counts, or a percent of the value for
+large readings like fan RPM. Intervals stay between configured bounds and
+drop back to the minimum for a while after any write or user mode change,
+when everything is expected to move.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from .const import (
+    ADAPTIVE_FAST_HOLD_SECONDS,
+    ADAPTIVE_SMOOTHING,
+    ADAPTIVE_TARGET_COUNTS,
+    ADAPTIVE_TARGET_RELATIVE,
+)
+from .registers import ALARM_KEYS, HEARTBEAT_BATCH, REGISTER_BATCHES
+
+
+def _signed_step(old: int, new: int) -> int:
+    """Return the step between two raw 16-bit values, treating wrap-around as a small signed step."""
+    return ((new - old + 0x8000) & 0xFFFF) - 0x8000
+
+
+@dataclass
+class KeyVolatility:
+    """Smoothed change statistics of one key, in raw counts per second."""
+
+    raw: int
+    read_at: float
+    rate: float = 0.0  # mean absolute change per second
+    variance: float = 0.0  # variance of the signed change per second
+    mean: float = 0.0  # mean signed change per second, for the variance
+    interval: float = 0.0
+
+
+class AdaptiveScheduler:
+    """Per-batch poll intervals derived from the observed volatility of each batch's keys."""
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        # Alarms drive events and the heartbeat gates the sweep; batches with their own interval keep it
+        self.batches: frozenset[int] = frozenset(
+            index
+            for index, batch in enumerate(REGISTER_BATCHES)
+            if batch is not HEARTBEAT_BATCH
+            and not batch.get("interval")
+            and not any(key in ALARM_KEYS for key in batch["keys"] if key)
+        )
+        self._keys: dict[str, KeyVolatility] = {}
+        self._intervals: dict[int, float] = {index: min_interval for index in self.batches}
+        self._fast_until = 0.0
+
+    def interval(self, index: int) -> float | None:
+        """Return the batch's current poll interval, or None if it is not adaptive."""
+        return self._intervals.get(index)
+
+    def key_intervals(self) -> dict[str, float]:
+        """Return the current interval of every key in an adaptive batch."""
+        return {
+            key: self._intervals[index]
+            for index in self.batches
+            for key in REGISTER_BATCHES[index]["keys"]
+            if key
+        }
+
+    def observe(self, index: int, registers: list[int], now: float) -> bool:
+        """Learn from a fresh read of a batch; return True if its interval changed."""
+        if index not in self.batches:
+            return False
+        intervals = []
+        for key, raw in zip(REGISTER_BATCHES[index]["keys"], registers):
+            if key:
+                intervals.append(self._observe_key(key, raw, now))
+        interval = self.min_interval if now < self._fast_until else min(intervals, default=self.max_interval)
+        # Relax gradually so one quiet read cannot jump straight to the maximum
+        interval = min(interval, self._intervals[index] * 2)
+        if interval == self._intervals[index]:
+            return False
+        self._intervals[index] = interval
+        return True
+
+    def _observe_key(self, key: str, raw: int, now: float) -> float:
+        stats = self._keys.get(key)
+        if stats is None:
+            self._keys[key] = KeyVolatility(raw, now, interval=self.min_interval)
+            return self.min_interval
+        elapsed = now - stats.read_at
+        if elapsed <= 0:
+            return stats.interval
+        speed = _signed_step(stats.raw, raw) / elapsed
+        alpha = ADAPTIVE_SMOOTHING
+        stats.rate += alpha * (abs(speed) - stats.rate)
+        deviation = speed - stats.mean
+        stats.mean += alpha * deviation
+        stats.variance = (1 - alpha) * (stats.variance + alpha * deviation * deviation)
+        stats.raw, stats.read_at = raw, now
+
+        magnitude = abs(_signed_step(0, raw))
+        target = max(ADAPTIVE_TARGET_COUNTS, ADAPTIVE_TARGET_RELATIVE * magnitude)
+        drift = stats.rate + math.sqrt(stats.variance)
+        interval = target / drift if drift else self.max_interval
+        stats.interval = min(self.max_interval, max(self.min_interval, interval))
+        return stats.interval
+
+    def reset(self, now: float) -> None:
+        """Poll every adaptive batch at the minimum interval for a while, e.g. after a write or mode change."""
+        self._fast_until = now + ADAPTIVE_FAST_HOLD_SECONDS
+        for index in self._intervals:
+            self._intervals[index] = self.min_interval
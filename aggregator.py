@@ -0,0 +1,150 @@
+"""In-memory statistics aggregation for numeric snapshot keys.
+
+Instead of letting the recorder compile long-term statistics from a state
+write every poll cycle, the hub folds each snapshot into hourly mean/min/max
+buckets. Completed buckets are imported as external statistics; the hour in
+progress is persisted on unload so a restart does not leave a gap.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+LONG_TERM_SECONDS = 3600
+
+
+class Bucket:
+    """Running mean/min/max over one aligned period."""
+
+    __slots__ = ("start", "count", "total", "minimum", "maximum")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: Bucket) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    def as_list(self) -> list[float]:
+        return [self.start, self.count, self.total, self.minimum, self.maximum]
+
+    @classmethod
+    def from_list(cls, state: list[float]) -> Bucket:
+        bucket = cls(float(state[0]))
+        bucket.count = int(state[1])
+        bucket.total, bucket.minimum, bucket.maximum = (float(value) for value in state[2:5])
+        return bucket
+
+
+class StatisticsAggregator:
+    """Fold snapshots of tracked numeric keys into hourly buckets."""
+
+    def __init__(self) -> None:
+        self.keys: dict[str, tuple[str, str | None]] = {}  # key -> (name, unit)
+        self._long: dict[str, Bucket] = {}
+
+    def track(self, key: str, name: str, unit: str | None) -> None:
+        """Start aggregating a snapshot key."""
+        self.keys[key] = (name, unit)
+
+    def add(self, snapshot: Mapping[str, Any], now: float) -> list[tuple[str, Bucket]]:
+        """Add one snapshot taken at wall time now; return the hourly buckets it completed."""
+        long_start = now - now % LONG_TERM_SECONDS
+        completed: list[tuple[str, Bucket]] = []
+        for key in self.keys:
+            value = snapshot.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+
+            bucket = self._long.get(key)
+            if bucket is None or bucket.start != long_start:
+                if bucket is not None:
+                    completed.append((key, bucket))
+                bucket = self._long[key] = Bucket(long_start)
+            bucket.add(value)
+        return completed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the hourly buckets in progress, for persisting across a restart."""
+        return {"buckets": {key: bucket.as_list() for key, bucket in self._long.items()}}
+
+    def load(self, data: Mapping[str, Any] | None, now: float) -> list[tuple[str, Bucket]]:
+        """Restore buckets saved by as_dict(); return those whose hour ended meanwhile."""
+        long_start = now - now % LONG_TERM_SECONDS
+        completed: list[tuple[str, Bucket]] = []
+        for key, state in ((data or {}).get("buckets") or {}).items():
+            if key not in self.keys:
+                continue
+            try:
+                bucket = Bucket.from_list(state)
+            except (TypeError, ValueError, IndexError):
+                continue
+            if bucket.count <= 0:
+                continue
+            if bucket.start == long_start:
+                current = self._long.get(key)
+                if current is not None and current.start == long_start:
+                    bucket.merge(current)
+                self._long[key] = bucket
+            elif bucket.start < long_start:
+                completed.append((key, bucket))
+        return completed
+
+
+def statistic_id(entry_id: str, key: str) -> str:
+    """Return the external statistic id for a key of a config entry."""
+    return f"{DOMAIN}:{entry_id.lower()}_{key.lower()}"
+
+
+def async_import_hourly(hass: Any, entry_id: str, aggregator: StatisticsAggregator, completed: list[tuple[str, Bucket]]) -> None:
+    """Queue completed hourly buckets for import into the recorder as external statistics."""
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    try:
+        from homeassistant.components.recorder.models import StatisticMeanType
+    except ImportError:  # pragma: no cover - older Home Assistant
+        StatisticMeanType = None
+
+    for key, bucket in completed:
+        name, unit = aggregator.keys[key]
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=name,
+            source=DOMAIN,
+            statistic_id=statistic_id(entry_id, key),
+            unit_of_measurement=unit,
+        )
+        if StatisticMeanType is not None:
+            metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+            metadata["unit_class"] = None
+        start = datetime.fromtimestamp(bucket.start, timezone.utc)
+        async_add_external_statistics(
+            hass, metadata, [StatisticData(start=start, mean=bucket.mean, min=bucket.minimum, max=bucket.maximum)]
+        )
+        _LOGGER.debug("Imported hourly statistics for %s at %s (%s samples)", key, start, bucket.count)
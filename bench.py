@@ -0,0 +1,187 @@
+"""Microbenchmarks for the per-cycle CPU hot paths.
+
+Times the work a poll cycle does besides waiting on the bus: storing
+register payloads into the image, decoding the snapshot, the per-entity
+fan-out (availability check, value lookup and deadband decision for every
+entity, through the same code the sensor platform runs) and delta encoding
+for publishing. Each benchmark runs at 1, 10 and 50
+units' worth of entities against payloads recorded from the simulated
+unit. Results can be saved as a baseline and later runs compared with it
+(exit status 1 when a benchmark regressed beyond the allowed ratio).
+
+    python -m custom_components.systemair_save_vsr.bench --save baseline.json
+    python -m custom_components.systemair_save_vsr.bench --compare baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+from .const import DEFAULT_STALE_AFTER_SECONDS, PUBLISH_FORMAT_JSON
+from .deadband import PublishedState, PublishFilter, sensor_value
+from .engine import SAVEVSREngine
+from .publisher import DeltaEncoder
+from .registers import ALARM_KEYS, ALARM_STATE_MAP, KEY_MAP, REGISTER_BATCHES
+from .simulator import SimulatedUnit
+
+UNIT_COUNTS = (1, 10, 50)
+
+# Every numeric entity takes the deadband check, the costliest path a sensor update can take
+BENCH_FILTER = PublishFilter(deadband=0.2, deadband_relative=0.02)
+
+
+def record_payloads(seed: int = 0) -> list[list[int]]:
+    """Return one response payload per register batch, in batch order."""
+    unit = SimulatedUnit(seed=seed)
+    return [unit.read(batch["type"], batch["start"], batch["count"]) for batch in REGISTER_BATCHES]
+
+
+def _vary(payloads: list[list[int]]) -> list[list[int]]:
+    """Return payloads with a few registers changed, as between two real cycles."""
+    varied = [list(registers) for registers in payloads]
+    for registers in varied[::7]:
+        registers[0] = (registers[0] + 1) & 0xFFFF
+    return varied
+
+
+class _Fleet:
+    """Engines for several units, fed from recorded payloads instead of a bus."""
+
+    def __init__(self, units: int, payloads: list[list[int]]) -> None:
+        self.engines = [SAVEVSREngine(lambda: None, DEFAULT_STALE_AFTER_SECONDS) for _ in range(units)]
+        self.encoders = [DeltaEncoder(str(index), PUBLISH_FORMAT_JSON) for index in range(units)]
+        # One (key, value map, published state) per sensor entity of each unit
+        self.sensors = [
+            [
+                (key, ALARM_STATE_MAP, PublishedState(None)) if key in ALARM_KEYS else (key, None, PublishedState(BENCH_FILTER))
+                for key in KEY_MAP
+            ]
+            for _ in range(units)
+        ]
+        self.payloads = [payloads, _vary(payloads)]
+        self.turn = 0
+        self.store()
+
+    def store(self) -> None:
+        payloads = self.payloads[self.turn]
+        self.turn ^= 1
+        for engine in self.engines:
+            store = engine.image.store
+            for batch, registers in zip(REGISTER_BATCHES, payloads):
+                store(batch["type"], batch["start"], registers)
+
+    def decode(self) -> None:
+        for engine in self.engines:
+            dict(engine.snapshot(online=True))
+
+    def fan_out(self) -> None:
+        """Run what every sensor entity does on a coordinator update, short of the state write."""
+        # Alternate the payloads so some values move, as between two real cycles
+        self.store()
+        now = time.monotonic()
+        for engine, sensors in zip(self.engines, self.sensors):
+            data = engine.snapshot(online=True)
+            for key, value_map, state in sensors:
+                state.update(sensor_value(data, key, value_map), data.is_key_available(key), now)
+
+    def publish(self) -> None:
+        self.store()
+        for engine, encoder in zip(self.engines, self.encoders):
+            encoder.delta(engine.snapshot(online=True))
+
+
+BENCHMARKS: dict[str, Callable[[_Fleet], None]] = {
+    "image_store": _Fleet.store,
+    "snapshot_decode": _Fleet.decode,
+    "entity_fan_out": _Fleet.fan_out,
+    "delta_publish": _Fleet.publish,
+}
+
+
+def _time(func: Callable[[], None], rounds: int, min_time: float) -> dict[str, float]:
+    """Return per-call timings in microseconds, calibrating the loop count to min_time per round."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= min_time / 10 or loops >= 1 << 20:
+            break
+        loops *= 2
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops * 1e6)
+    return {
+        "min_us": round(min(samples), 2),
+        "median_us": round(statistics.median(samples), 2),
+        "stdev_us": round(statistics.stdev(samples), 2) if len(samples) > 1 else 0.0,
+        "loops": loops,
+    }
+
+
+def run_benchmarks(
+    units: tuple[int, ...] = UNIT_COUNTS, rounds: int = 7, min_time: float = 0.1, selected: list[str] | None = None
+) -> dict[str, dict[str, dict[str, float]]]:
+    """Run the benchmarks and return {benchmark: {units: timings}}."""
+    payloads = record_payloads()
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name, bench in BENCHMARKS.items():
+        if selected and name not in selected:
+            continue
+        results[name] = {}
+        for count in units:
+            fleet = _Fleet(count, payloads)
+            results[name][str(count)] = _time(lambda: bench(fleet), rounds, min_time)
+    return results
+
+
+def compare(results: dict, baseline: dict, max_ratio: float) -> list[str]:
+    """Return a message for every benchmark whose median slowed down beyond max_ratio."""
+    regressions = []
+    for name, by_units in results.items():
+        for units, timings in by_units.items():
+            base = baseline.get(name, {}).get(units)
+            if not base or not base["median_us"]:
+                continue
+            ratio = timings["median_us"] / base["median_us"]
+            timings["baseline_ratio"] = round(ratio, 3)
+            if ratio > max_ratio:
+                regressions.append(f"{name}[{units} units]: {ratio:.2f}x baseline")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SAVE VSR decode, mapping and fan-out hot paths.")
+    parser.add_argument("--units", type=int, action="append", help="unit counts to run (default 1, 10, 50)")
+    parser.add_argument("--bench", action="append", choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="target seconds per round")
+    parser.add_argument("--save", help="write results to this baseline file")
+    parser.add_argument("--compare", help="compare against this baseline file")
+    parser.add_argument("--max-ratio", type=float, default=1.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(tuple(args.units or UNIT_COUNTS), args.rounds, args.min_time, args.bench)
+    regressions: list[str] = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file)["results"], args.max_ratio)
+
+    report = {"python": sys.version.split()[0], "results": results, "regressions": regressions}
+    output = json.dumps(report, indent=2)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .__init__ import SAVEVSRHub
+from .hub import SAVEVSRHub
+from .entity import SAVEVSRRefreshMixin
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
     hub: SAVEVSRHub = hass.data[DOMAIN][entry.entry_id]
@@ -19,10 +20,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         SAVEVSRBinarySensor(hub, "Mode Summer Winter", "vsr_mode_summerwinter", BinarySensorDeviceClass.HEAT, "mode_summerwinter"),
         SAVEVSRBinarySensor(hub, "Fan Running", "vsr_fan_running", BinarySensorDeviceClass.RUNNING, "fan_running"),
         SAVEVSRBinarySensor(hub, "Cooling Recovery", "vsr_cooling_recovery", BinarySensorDeviceClass.COLD, "cooling_recovery"),
+        SAVEVSRBinarySensor(hub, "Online", "vsr_online", BinarySensorDeviceClass.CONNECTIVITY, "online"),
     ]
     async_add_entities(entities)
 
-class SAVEVSRBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class SAVEVSRBinarySensor(SAVEVSRRefreshMixin, CoordinatorEntity, BinarySensorEntity):
     """SAVE VSR binary sensor."""
     _attr_has_entity_name = True  # Recommended for new integrations:contentReference[oaicite:7]{index=7}
 
@@ -33,11 +35,16 @@ class SAVEVSRBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_unique_id = unique_id
         self._attr_device_class = device_class
         self._key = key
+        self.refresh_keys = (key,)
         self._attr_device_info = hub.device_info
 
+    @property
+    def available(self) -> bool:
+        return super().available and self.hub.is_key_available(self._key)
+
     @property
     def is_on(self) -> bool | None:
         data = self.coordinator.data
-        if not data:
+        if data is None:
             return None
         return bool(data.get(self._key, False))
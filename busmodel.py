@@ -0,0 +1,57 @@
+"""Modbus RTU bus utilization model.
+
+Estimates the wire time of a poll cycle from frame sizes, the line settings,
+the 3.5-character inter-frame gaps and the unit's turnaround time, so a
+register plan can be checked against the poll interval before it starts
+timing out on a slow bus.
+"""
+from __future__ import annotations
+
+from .const import BUS_TURNAROUND_SECONDS
+from .registers import REGISTER_BATCHES
+from .rtu import char_time, frame_gap
+
+# Bytes on the wire for a read: request is slave, function, address, count and CRC;
+# the response carries slave, function, byte count, the registers and CRC.
+READ_REQUEST_BYTES = 8
+READ_RESPONSE_OVERHEAD = 5
+WRITE_SINGLE_BYTES = 8
+WRITE_MULTIPLE_OVERHEAD = 9
+
+
+def transaction_time(request_bytes: int, response_bytes: int, config: dict) -> float:
+    """Return the bus time of one request/response pair in seconds."""
+    line = (int(config["baudrate"]), int(config["bytesize"]), config["parity"], int(config["stopbits"]))
+    return (request_bytes + response_bytes) * char_time(*line) + 2 * frame_gap(*line) + BUS_TURNAROUND_SECONDS
+
+
+def read_time(count: int, config: dict) -> float:
+    """Return the bus time of reading count registers in one request."""
+    return transaction_time(READ_REQUEST_BYTES, READ_RESPONSE_OVERHEAD + 2 * count, config)
+
+
+def write_time(count: int, config: dict) -> float:
+    """Return the bus time of writing count registers (FC06 for one, FC16 otherwise)."""
+    if count == 1:
+        return transaction_time(WRITE_SINGLE_BYTES, WRITE_SINGLE_BYTES, config)
+    return transaction_time(WRITE_MULTIPLE_OVERHEAD + 2 * count, WRITE_SINGLE_BYTES, config)
+
+
+def estimate_cycle(config: dict, interval: float, batches: list[dict] = REGISTER_BATCHES) -> dict:
+    """Estimate steady-state bus use of the poll plan.
+
+    Batches with their own interval are amortized over the cycles between
+    their reads. Returns the expected wire time per cycle, the worst case
+    (every batch due at once) and the load as a percentage of the interval.
+    """
+    average = worst = 0.0
+    for batch in batches:
+        seconds = read_time(batch["count"], config)
+        worst += seconds
+        batch_interval = batch.get("interval")
+        average += seconds * min(1.0, interval / batch_interval) if batch_interval else seconds
+    return {
+        "estimated_cycle_seconds": round(average, 3),
+        "worst_cycle_seconds": round(worst, 3),
+        "estimated_load": round(100 * average / interval, 1),
+    }
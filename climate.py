@@ -8,7 +8,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, SLAVE_ID
-from .__init__ import SAVEVSRHub
+from .hub import SAVEVSRHub
+from .entity import SAVEVSRRefreshMixin
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -16,7 +17,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities([SAVEVSRClimate(hub)])
 
 
-class SAVEVSRClimate(CoordinatorEntity[SAVEVSRHub], ClimateEntity):
+class SAVEVSRClimate(SAVEVSRRefreshMixin, CoordinatorEntity[SAVEVSRHub], ClimateEntity):
     """SAVE VSR climate entity."""
 
     _attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.FAN_MODE | ClimateEntityFeature.PRESET_MODE
@@ -26,6 +27,7 @@ class SAVEVSRClimate(CoordinatorEntity[SAVEVSRHub], ClimateEntity):
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_name = "Vent SAVE VSR"
     _attr_unique_id = "vsr_vent_SAVE_VSR"
+    refresh_keys = ("temp_supply", "target_temp", "mode_main", "mode_speed")
 
     def __init__(self, hub: SAVEVSRHub) -> None:
         super().__init__(hub.coordinator)
@@ -4,11 +4,65 @@ from __future__ import annotations
 import logging
 
 from homeassistant import config_entries
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from pymodbus.client import ModbusSerialClient as ModbusClient
 import voluptuous as vol
 
-from .const import DOMAIN
+from .busmodel import estimate_cycle
+from .const import (
+    DOMAIN,
+    UPDATE_INTERVAL_SECONDS,
+    BUS_LOAD_WARN_PERCENT,
+    CONF_STALE_AFTER,
+    DEFAULT_STALE_AFTER_SECONDS,
+    CONF_TRANSPORT,
+    TRANSPORT_NATIVE,
+    TRANSPORT_PYMODBUS,
+    CONF_PUBLISH,
+    CONF_PUBLISH_TARGET,
+    CONF_PUBLISH_FORMAT,
+    PUBLISH_NONE,
+    PUBLISH_MQTT,
+    PUBLISH_UNIX,
+    PUBLISH_FORMAT_JSON,
+    PUBLISH_FORMAT_MSGPACK,
+    CONF_GATEWAY_PORT,
+    DEFAULT_GATEWAY_PORT,
+    CONF_GATEWAY_MAX_AGE,
+    DEFAULT_GATEWAY_MAX_AGE_SECONDS,
+    CONF_GATEWAY_HOST,
+    DEFAULT_GATEWAY_HOST,
+    CONF_GATEWAY_READ_ONLY,
+    DEFAULT_GATEWAY_READ_ONLY,
+    CONF_CONTROLLER,
+    CONF_CONTROL_TEMP_MEDIUM,
+    CONF_CONTROL_TEMP_HIGH,
+    CONF_CONTROL_HUMIDITY_ENTITY,
+    CONF_CONTROL_HUMIDITY_MEDIUM,
+    CONF_CONTROL_HUMIDITY_HIGH,
+    CONF_CONTROL_MIN_DWELL,
+    DEFAULT_CONTROL_TEMP_MEDIUM,
+    DEFAULT_CONTROL_TEMP_HIGH,
+    DEFAULT_CONTROL_HUMIDITY_MEDIUM,
+    DEFAULT_CONTROL_HUMIDITY_HIGH,
+    DEFAULT_CONTROL_MIN_DWELL_SECONDS,
+    CONF_IMPORT_STATISTICS,
+    CONF_STATISTICS_ONLY,
+    CONF_OBSERVER_POLLING,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    CONF_SENSOR_FILTERS,
+    DEFAULT_SENSOR_HEARTBEAT_SECONDS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL_SECONDS,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL_SECONDS,
+)
+from .registers import KEY_MAP
+from .sensor import SENSORS, SAVEVSRSensorDescription
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,15 +85,66 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
+def _temperature_selector() -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(min=10, max=40, step=0.5, unit_of_measurement="°C", mode=selector.NumberSelectorMode.BOX)
+    )
+
+
+def _humidity_selector() -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(min=0, max=100, step=1, unit_of_measurement="%", mode=selector.NumberSelectorMode.BOX)
+    )
+
+
+# Numeric sensors whose state writes can be thinned out with a deadband
+FILTERABLE_SENSORS: dict[str, SAVEVSRSensorDescription] = {
+    description.key: description
+    for description in SENSORS
+    if description.state_class == SensorStateClass.MEASUREMENT and description.coordinator_key in KEY_MAP
+}
+
+# Options form toggle (not stored) that continues with the per-sensor deadband steps
+CONF_CONFIGURE_FILTERS = "configure_sensor_filters"
+
+
+def _interval_selector() -> selector.NumberSelector:
+    return selector.NumberSelector(
+        selector.NumberSelectorConfig(min=5, max=3600, step=5, unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX)
+    )
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Systemair SAVE VSR."""
 
     VERSION = 1
 
+    # Settings the bus capacity warning was last shown for; submitting them again proceeds
+    _bus_warned_for: dict | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> OptionsFlowHandler:
+        """Return the options flow handler."""
+        return OptionsFlowHandler()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {}
         if user_input is not None:
+            estimate = estimate_cycle(user_input, UPDATE_INTERVAL_SECONDS)
+            if estimate["estimated_load"] > BUS_LOAD_WARN_PERCENT and user_input != self._bus_warned_for:
+                self._bus_warned_for = dict(user_input)
+                errors["base"] = "bus_over_capacity"
+                placeholders["bus_load"] = str(estimate["estimated_load"])
+                return self.async_show_form(
+                    step_id="user",
+                    data_schema=self.add_suggested_values_to_schema(STEP_USER_DATA_SCHEMA, user_input),
+                    errors=errors,
+                    description_placeholders=placeholders,
+                )
+
             client = ModbusClient(
                 port=user_input["port"],
                 baudrate=user_input["baudrate"],
@@ -58,3 +163,210 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
 
         return self.async_show_form(step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Systemair SAVE VSR options."""
+
+    def __init__(self) -> None:
+        self._options: dict = {}
+        self._filter_sensor: str | None = None
+
+    async def async_step_init(self, user_input=None):
+        """Manage polling options."""
+        if user_input is not None:
+            configure_filters = user_input.pop(CONF_CONFIGURE_FILTERS, False)
+            # Per-sensor filters are edited in their own steps; keep them across this form
+            self._options = {
+                **user_input,
+                CONF_SENSOR_FILTERS: dict(self.config_entry.options.get(CONF_SENSOR_FILTERS, {})),
+            }
+            if configure_filters:
+                return await self.async_step_sensor_filter_select()
+            return self.async_create_entry(title="", data=self._options)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_STALE_AFTER, default=options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER_SECONDS)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=5, max=3600, step=5, unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Required(
+                    CONF_TRANSPORT, default=options.get(CONF_TRANSPORT, TRANSPORT_PYMODBUS)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[TRANSPORT_PYMODBUS, TRANSPORT_NATIVE],
+                        translation_key=CONF_TRANSPORT,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Required(
+                    CONF_PUBLISH, default=options.get(CONF_PUBLISH, PUBLISH_NONE)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[PUBLISH_NONE, PUBLISH_MQTT, PUBLISH_UNIX],
+                        translation_key=CONF_PUBLISH,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Optional(
+                    CONF_PUBLISH_TARGET, description={"suggested_value": options.get(CONF_PUBLISH_TARGET)}
+                ): str,
+                vol.Required(
+                    CONF_PUBLISH_FORMAT, default=options.get(CONF_PUBLISH_FORMAT, PUBLISH_FORMAT_JSON)
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[PUBLISH_FORMAT_JSON, PUBLISH_FORMAT_MSGPACK],
+                        translation_key=CONF_PUBLISH_FORMAT,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    )
+                ),
+                vol.Required(
+                    CONF_GATEWAY_PORT, default=options.get(CONF_GATEWAY_PORT, DEFAULT_GATEWAY_PORT)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(min=0, max=65535, step=1, mode=selector.NumberSelectorMode.BOX)
+                ),
+                vol.Required(
+                    CONF_GATEWAY_HOST, default=options.get(CONF_GATEWAY_HOST, DEFAULT_GATEWAY_HOST)
+                ): str,
+                vol.Required(
+                    CONF_GATEWAY_READ_ONLY, default=options.get(CONF_GATEWAY_READ_ONLY, DEFAULT_GATEWAY_READ_ONLY)
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_GATEWAY_MAX_AGE, default=options.get(CONF_GATEWAY_MAX_AGE, DEFAULT_GATEWAY_MAX_AGE_SECONDS)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=3600, step=1, unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Required(CONF_CONTROLLER, default=options.get(CONF_CONTROLLER, False)): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_CONTROL_TEMP_MEDIUM, default=options.get(CONF_CONTROL_TEMP_MEDIUM, DEFAULT_CONTROL_TEMP_MEDIUM)
+                ): _temperature_selector(),
+                vol.Required(
+                    CONF_CONTROL_TEMP_HIGH, default=options.get(CONF_CONTROL_TEMP_HIGH, DEFAULT_CONTROL_TEMP_HIGH)
+                ): _temperature_selector(),
+                vol.Optional(
+                    CONF_CONTROL_HUMIDITY_ENTITY,
+                    description={"suggested_value": options.get(CONF_CONTROL_HUMIDITY_ENTITY)},
+                ): selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor", device_class="humidity")),
+                vol.Required(
+                    CONF_CONTROL_HUMIDITY_MEDIUM,
+                    default=options.get(CONF_CONTROL_HUMIDITY_MEDIUM, DEFAULT_CONTROL_HUMIDITY_MEDIUM),
+                ): _humidity_selector(),
+                vol.Required(
+                    CONF_CONTROL_HUMIDITY_HIGH,
+                    default=options.get(CONF_CONTROL_HUMIDITY_HIGH, DEFAULT_CONTROL_HUMIDITY_HIGH),
+                ): _humidity_selector(),
+                vol.Required(
+                    CONF_CONTROL_MIN_DWELL, default=options.get(CONF_CONTROL_MIN_DWELL, DEFAULT_CONTROL_MIN_DWELL_SECONDS)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=3600, step=10, unit_of_measurement="s", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Required(
+                    CONF_IMPORT_STATISTICS, default=options.get(CONF_IMPORT_STATISTICS, False)
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_STATISTICS_ONLY, default=options.get(CONF_STATISTICS_ONLY, False)
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_OBSERVER_POLLING, default=options.get(CONF_OBSERVER_POLLING, False)
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING, default=options.get(CONF_ADAPTIVE_POLLING, False)
+                ): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_ADAPTIVE_MIN_INTERVAL,
+                    default=options.get(CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL_SECONDS),
+                ): _interval_selector(),
+                vol.Required(
+                    CONF_ADAPTIVE_MAX_INTERVAL,
+                    default=options.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL_SECONDS),
+                ): _interval_selector(),
+                vol.Required(CONF_CONFIGURE_FILTERS, default=False): selector.BooleanSelector(),
+                vol.Required(
+                    CONF_TRACE_SAMPLE_RATE, default=options.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=100, step=0.1, unit_of_measurement="%", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+            }
+        )
+        estimate = estimate_cycle(self.config_entry.data, UPDATE_INTERVAL_SECONDS)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=schema,
+            description_placeholders={
+                "bus_load": str(estimate["estimated_load"]),
+                "baudrate": str(self.config_entry.data["baudrate"]),
+            },
+        )
+
+    async def async_step_sensor_filter_select(self, user_input=None):
+        """Pick a sensor whose deadband to edit; submitting without one saves the options."""
+        if user_input is not None:
+            if not user_input.get("sensor"):
+                return self.async_create_entry(title="", data=self._options)
+            self._filter_sensor = user_input["sensor"]
+            return await self.async_step_sensor_filter()
+
+        return self.async_show_form(
+            step_id="sensor_filter_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional("sensor"): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=description.key, label=description.name)
+                                for description in FILTERABLE_SENSORS.values()
+                            ],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                }
+            ),
+        )
+
+    async def async_step_sensor_filter(self, user_input=None):
+        """Edit one sensor's deadband and heartbeat."""
+        description = FILTERABLE_SENSORS[self._filter_sensor]
+        if user_input is not None:
+            self._options[CONF_SENSOR_FILTERS][description.key] = user_input
+            return await self.async_step_sensor_filter_select()
+
+        current = self._options[CONF_SENSOR_FILTERS].get(description.key, {})
+        relative = description.deadband_relative * 100 if description.deadband_relative else 0.0
+        schema = vol.Schema(
+            {
+                vol.Required("deadband", default=current.get("deadband", description.deadband or 0.0)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0,
+                        max=1000,
+                        step="any",
+                        unit_of_measurement=description.native_unit_of_measurement,
+                        mode=selector.NumberSelectorMode.BOX,
+                    )
+                ),
+                vol.Required("deadband_percent", default=current.get("deadband_percent", relative)): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=100, step=0.1, unit_of_measurement="%", mode=selector.NumberSelectorMode.BOX
+                    )
+                ),
+                vol.Required(
+                    "heartbeat", default=current.get("heartbeat", description.heartbeat or DEFAULT_SENSOR_HEARTBEAT_SECONDS)
+                ): _interval_selector(),
+            }
+        )
+        return self.async_show_form(
+            step_id="sensor_filter",
+            data_schema=schema,
+            description_placeholders={"sensor": description.name},
+        )
+
@@ -2,3 +2,136 @@
 DOMAIN = "systemair_save_vsr"
 UPDATE_INTERVAL_SECONDS = 5
 SLAVE_ID = 1
+
+# Fired once per alarm state transition detected by the hub
+EVENT_ALARM = "systemair_save_vsr_alarm"
+# Fired once per new entry found in the unit's alarm log
+EVENT_ALARM_LOG = "systemair_save_vsr_alarm_log"
+# Poll cycle budget; blocks not read before the deadline are deferred to the next cycle
+CYCLE_BUDGET_SECONDS = 4.0
+READ_TIMEOUT_SECONDS = 3.0
+RETRY_DELAY_SECONDS = 0.5
+
+# Countdown registers are extrapolated locally and re-read on this interval or after a mode change
+COUNTDOWN_RESYNC_SECONDS = 600
+
+# Heartbeat read and offline backoff
+HEARTBEAT_TIMEOUT_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 300
+
+# Options
+CONF_STALE_AFTER = "stale_after"
+DEFAULT_STALE_AFTER_SECONDS = 60
+CONF_TRANSPORT = "transport"
+TRANSPORT_PYMODBUS = "pymodbus"
+TRANSPORT_NATIVE = "native"
+CONF_PUBLISH = "publish"
+CONF_PUBLISH_TARGET = "publish_target"
+CONF_PUBLISH_FORMAT = "publish_format"
+PUBLISH_NONE = "none"
+PUBLISH_MQTT = "mqtt"
+PUBLISH_UNIX = "unix"
+PUBLISH_FORMAT_JSON = "json"
+PUBLISH_FORMAT_MSGPACK = "msgpack"
+DEFAULT_PUBLISH_TOPIC = "systemair_save_vsr/snapshot"
+PUBLISH_STATE_SUBTOPIC = "state"  # retained full snapshot next to the delta topic
+DEFAULT_PUBLISH_SOCKET = "systemair_save_vsr.sock"  # relative to the HA config directory
+CONF_GATEWAY_PORT = "gateway_port"  # 0 disables the Modbus TCP gateway
+DEFAULT_GATEWAY_PORT = 0
+CONF_GATEWAY_MAX_AGE = "gateway_max_age"
+DEFAULT_GATEWAY_MAX_AGE_SECONDS = 10
+# Modbus TCP has no authentication: listen on loopback and refuse writes unless configured otherwise
+CONF_GATEWAY_HOST = "gateway_host"
+DEFAULT_GATEWAY_HOST = "127.0.0.1"
+CONF_GATEWAY_READ_ONLY = "gateway_read_only"
+DEFAULT_GATEWAY_READ_ONLY = True
+CONF_CONTROLLER = "controller"
+CONF_CONTROL_TEMP_MEDIUM = "control_temp_medium"
+CONF_CONTROL_TEMP_HIGH = "control_temp_high"
+CONF_CONTROL_HUMIDITY_ENTITY = "control_humidity_entity"
+CONF_CONTROL_HUMIDITY_MEDIUM = "control_humidity_medium"
+CONF_CONTROL_HUMIDITY_HIGH = "control_humidity_high"
+CONF_CONTROL_MIN_DWELL = "control_min_dwell"
+DEFAULT_CONTROL_TEMP_MEDIUM = 23.0
+DEFAULT_CONTROL_TEMP_HIGH = 26.0
+DEFAULT_CONTROL_HUMIDITY_MEDIUM = 60.0
+DEFAULT_CONTROL_HUMIDITY_HIGH = 75.0
+DEFAULT_CONTROL_MIN_DWELL_SECONDS = 300
+CONF_IMPORT_STATISTICS = "import_statistics"
+CONF_OBSERVER_POLLING = "observer_polling"
+CONF_STATISTICS_ONLY = "statistics_only"  # drop state_class so the recorder compiles no statistics itself
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_ADAPTIVE_MIN_INTERVAL = "adaptive_min_interval"
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+DEFAULT_ADAPTIVE_MIN_INTERVAL_SECONDS = 5
+DEFAULT_ADAPTIVE_MAX_INTERVAL_SECONDS = 60
+CONF_SENSOR_FILTERS = "sensor_filters"  # per-sensor deadband/heartbeat overrides, keyed by description key
+DEFAULT_SENSOR_HEARTBEAT_SECONDS = 600
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"  # percent of cycles and transactions traced; 0 disables tracing
+DEFAULT_TRACE_SAMPLE_RATE = 0
+
+# Demand controller: step-down margin as a fraction of the medium-to-high band, and write budget
+CONTROL_HYSTERESIS = 0.2
+CONTROL_MAX_WRITES_PER_HOUR = 6
+
+# Hourly statistics bucket in progress, persisted between restarts
+STATISTICS_STORAGE_VERSION = 1
+
+# Bus model: unit response latency per transaction and the load that risks timeouts
+BUS_TURNAROUND_SECONDS = 0.03
+BUS_LOAD_WARN_PERCENT = 80
+
+# On-demand entity refreshes reuse registers read this recently (coalesces bursts of update_entity calls)
+ON_DEMAND_MAX_AGE_SECONDS = 1.0
+
+# Register groups no automation, script, recorder or on-demand refresh uses are polled this rarely
+UNOBSERVED_POLL_SECONDS = 300
+# How often consumers are re-examined, and how long an on-demand refresh counts as observing a key
+OBSERVER_SCAN_SECONDS = 600
+OBSERVER_HOLD_SECONDS = 3600
+
+# Write journal: failed writes are replayed after an outage unless older than the expiry
+JOURNAL_EXPIRY_SECONDS = 900
+JOURNAL_MAX_ATTEMPTS = 3
+JOURNAL_STORAGE_VERSION = 1
+
+# Adaptive polling: EWMA weight of the newest read, the step worth seeing between two reads
+# (raw counts, or a fraction of the value when larger) and how long writes and mode changes force fast polling
+ADAPTIVE_SMOOTHING = 0.3
+ADAPTIVE_TARGET_COUNTS = 2
+ADAPTIVE_TARGET_RELATIVE = 0.01
+ADAPTIVE_FAST_HOLD_SECONDS = 120
+
+# Sampled traces: OTLP/JSON lines relative to the HA config directory, rotated at this size
+TRACE_FILE = "systemair_save_vsr_traces.jsonl"
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+# Alarm log: checked for new entries this often, cursor persisted between restarts
+ALARM_LOG_INTERVAL_SECONDS = 900
+ALARM_LOG_STORAGE_VERSION = 1
+
+# Seconds to wait for the Modbus worker thread to exit on unload
+WORKER_STOP_TIMEOUT_SECONDS = 5.0
+
+# Bus transaction priorities, most urgent first
+PRIORITY_USER = 0
+PRIORITY_GATEWAY = 1
+PRIORITY_POLL = 2
+
+# Skip writes when the register image confirmed the same value this recently
+WRITE_DEDUPE_SECONDS = 10
+
+# Bulk register operations (week schedule)
+SCHEDULE_CACHE_SECONDS = 3600
+# Configuration snapshots: diff against image values read this recently, versioned file format
+CONFIG_CACHE_SECONDS = 300
+CONFIG_SNAPSHOT_VERSION = 1
+CONFIG_SNAPSHOT_DIR = "systemair_save_vsr_snapshots"  # relative to the HA config directory
+BULK_TIMEOUT_SECONDS = 15.0
+
+# Messages queued per snapshot socket client; beyond this, new changes are merged into the last queued one
+PUBLISH_QUEUE_SIZE = 32
+
+# Wait this long for a listening server to close once its client connections are gone
+SERVER_CLOSE_TIMEOUT_SECONDS = 5.0
@@ -0,0 +1,107 @@
+"""Local demand-based fan speed controller.
+
+Runs against each poll snapshot inside the hub instead of going through an
+automation round trip. Temperature and humidity are mapped to a demand score
+per input (0 at the medium threshold, 1 at the high threshold); the highest
+score picks the fan level. Hysteresis keeps the level from chattering around
+a threshold, a minimum dwell time holds each level, and a rolling write
+budget caps how often register 1130 is written at all.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Register 1130 values for the low, medium and high fan levels
+FAN_LEVELS: tuple[int, ...] = (2, 3, 4)
+# User mode (input 1160) in which 1130 sets the fan speed
+MODE_MANUAL = 1
+
+
+@dataclass
+class DemandInput:
+    """One demand source: readings at or above medium_at ask for medium, at high_at for high."""
+
+    medium_at: float
+    high_at: float
+
+    def score(self, value: float | None) -> float | None:
+        if value is None or self.high_at <= self.medium_at:
+            return None
+        return (value - self.medium_at) / (self.high_at - self.medium_at)
+
+
+class DemandController:
+    """Pick a fan level from demand inputs with hysteresis, dwell time and a write budget."""
+
+    def __init__(
+        self,
+        inputs: dict[str, DemandInput],
+        hysteresis: float,
+        min_dwell: float,
+        max_writes_per_hour: int,
+    ) -> None:
+        self.inputs = inputs
+        self.hysteresis = hysteresis
+        self.min_dwell = min_dwell
+        self.max_writes_per_hour = max_writes_per_hour
+        self._level: int | None = None
+        self._level_since = 0.0
+        self._writes: deque[float] = deque()
+        self.stats = {"writes": 0, "held_by_dwell": 0, "held_by_rate": 0, "overridden": 0}
+
+    def reset(self) -> None:
+        """Forget the tracked level, e.g. after a failed write."""
+        self._level = None
+
+    def _target_index(self, score: float, current: int) -> int:
+        """Return the level index for a demand score, stepping down only past the hysteresis band."""
+        index = 2 if score >= 1 else 1 if score >= 0 else 0
+        if index < current:
+            # Thresholds sit at scores 0 (medium) and 1 (high); stepping down needs a margin below them
+            index = max(index, 2 if score >= 1 - self.hysteresis else 1 if score >= -self.hysteresis else 0)
+        return index
+
+    def evaluate(self, readings: dict[str, float | None], speed: int | None, mode: int | None, now: float | None = None) -> int | None:
+        """Return the register 1130 value to write, or None to leave the unit alone."""
+        now = time.monotonic() if now is None else now
+        if mode != MODE_MANUAL or speed not in FAN_LEVELS:
+            # Not in manual mode (or speed unknown); the unit's own logic is in charge
+            self._level = None
+            return None
+
+        if speed != self._level:
+            # First run, or somebody else changed the speed: start the dwell from now
+            if self._level is not None:
+                self.stats["overridden"] += 1
+            self._level, self._level_since = speed, now
+
+        scores = [
+            score for key, demand in self.inputs.items()
+            if (score := demand.score(readings.get(key))) is not None
+        ]
+        if not scores:
+            return None
+        current = FAN_LEVELS.index(speed)
+        target = FAN_LEVELS[self._target_index(max(scores), current)]
+        if target == speed:
+            return None
+
+        if now - self._level_since < self.min_dwell:
+            self.stats["held_by_dwell"] += 1
+            return None
+        while self._writes and now - self._writes[0] >= 3600:
+            self._writes.popleft()
+        if len(self._writes) >= self.max_writes_per_hour:
+            self.stats["held_by_rate"] += 1
+            return None
+
+        _LOGGER.debug("Demand %.2f moves fan level from %s to %s", max(scores), speed, target)
+        self._writes.append(now)
+        self._level, self._level_since = target, now
+        self.stats["writes"] += 1
+        return target
@@ -0,0 +1,85 @@
+"""Deadband publishing for sensor entities.
+
+Noisy measurements only write a new state when they move beyond their
+deadband, their availability changes or a heartbeat is due. The value
+lookup and the publish decision live here, free of Home Assistant, so the
+sensor platform and the benchmarks run the same code.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_SENSOR_HEARTBEAT_SECONDS
+from .registers import map_value
+
+if TYPE_CHECKING:
+    from .sensor import SAVEVSRSensorDescription
+
+
+def sensor_value(data: Mapping[str, Any] | None, key: str, value_map: Mapping[int, str] | None) -> Any:
+    """Return the value of a snapshot key as a sensor shows it, mapped to its label if it has one."""
+    if data is None:
+        return None
+    return map_value(data.get(key), value_map)
+
+
+@dataclass(frozen=True)
+class PublishFilter:
+    """Deadband and heartbeat deciding when a numeric sensor writes a new state."""
+
+    deadband: float = 0.0
+    deadband_relative: float = 0.0
+    heartbeat: float = DEFAULT_SENSOR_HEARTBEAT_SECONDS
+
+    @classmethod
+    def for_description(cls, description: SAVEVSRSensorDescription, override: dict[str, Any]) -> PublishFilter | None:
+        """Return the filter from the description, with per-entity option overrides; None if it has no deadband."""
+        deadband = override.get("deadband", description.deadband) or 0.0
+        if "deadband_percent" in override:
+            relative = (override["deadband_percent"] or 0.0) / 100
+        else:
+            relative = description.deadband_relative or 0.0
+        if not deadband and not relative:
+            return None
+        heartbeat = override.get("heartbeat") or description.heartbeat or DEFAULT_SENSOR_HEARTBEAT_SECONDS
+        return cls(deadband, relative, heartbeat)
+
+    def should_publish(self, published: Any, value: Any, silent_for: float) -> bool:
+        """Return True if value differs from the published one by the deadband, or the heartbeat is due."""
+        if silent_for >= self.heartbeat:
+            return True
+        if not isinstance(value, (int, float)) or not isinstance(published, (int, float)):
+            return value != published
+        band = max(self.deadband, self.deadband_relative * abs(published))
+        # Tolerate float noise from register scaling (21.3 - 21.1 must count as 0.2)
+        return abs(value - published) >= band - 1e-9
+
+
+class PublishedState:
+    """The state a sensor last wrote, and whether a coordinator update should write again."""
+
+    __slots__ = ("filter", "value", "available", "published_at")
+
+    def __init__(self, publish_filter: PublishFilter | None) -> None:
+        self.filter = publish_filter
+        self.value: Any = None
+        self.available = False
+        self.published_at = 0.0
+
+    def publish(self, value: Any, available: bool, now: float) -> None:
+        self.value = value
+        self.available = available
+        self.published_at = now
+
+    def update(self, value: Any, available: bool, now: float) -> bool:
+        """Publish value and return True, unless it stays inside the deadband and the heartbeat is not due."""
+        if (
+            self.filter is not None
+            and available == self.available
+            and not self.filter.should_publish(self.value, value, now - self.published_at)
+        ):
+            return False
+        self.publish(value, available, now)
+        return True
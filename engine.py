@@ -0,0 +1,819 @@
+"""Modbus poll engine for Systemair SAVE VSR.
+
+Transport handling, cycle planning and decoding into the register image,
+independent of Home Assistant so it can be driven by the hub, the soak
+harness or a simulator alike.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .const import (
+    SLAVE_ID,
+    CYCLE_BUDGET_SECONDS,
+    READ_TIMEOUT_SECONDS,
+    RETRY_DELAY_SECONDS,
+    HEARTBEAT_TIMEOUT_SECONDS,
+    WRITE_DEDUPE_SECONDS,
+    SCHEDULE_CACHE_SECONDS,
+    BULK_TIMEOUT_SECONDS,
+    CONFIG_CACHE_SECONDS,
+    ON_DEMAND_MAX_AGE_SECONDS,
+    TRANSPORT_NATIVE,
+    TRANSPORT_PYMODBUS,
+    PRIORITY_USER,
+    PRIORITY_GATEWAY,
+    PRIORITY_POLL,
+)
+from .registers import (
+    ALARM_KEYS,
+    ALARM_LOG_ENTRIES,
+    ALARM_LOG_READ_ENTRIES,
+    ALARM_LOG_REGS_PER_ENTRY,
+    ALARM_LOG_START,
+    ALARM_STATE_MAP,
+    ALARM_SUMMARY_KEYS,
+    CONFIG_REGISTERS,
+    COUNTDOWN_BATCHES,
+    HEARTBEAT_BATCH,
+    KEY_INTERVALS,
+    KEY_MAP,
+    MAX_READ_REGISTERS,
+    MAX_WRITE_REGISTERS,
+    MODE_COMMAND_REGISTERS,
+    REGISTER_BATCHES,
+    SCHEDULE_COUNT,
+    SCHEDULE_START,
+    RegisterImage,
+    RegisterView,
+    changed_ranges,
+    coalesce_registers,
+    decode_schedule,
+    encode_schedule,
+    plan_config_writes,
+)
+from . import tracing
+from .adaptive import AdaptiveScheduler
+from .rtu import RtuClient, rtu_available
+from .tracing import Span, Tracer
+
+try:
+    from pymodbus.exceptions import ModbusException
+except ImportError:  # pragma: no cover - native transport and simulator work without pymodbus
+    ModbusException = OSError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EngineError(Exception):
+    """Raised when the engine cannot complete an operation on the unit."""
+
+
+class WriteRejected(EngineError):
+    """Raised when the unit answers a write with a Modbus exception; retrying will not help."""
+
+    def __init__(self, address: int, code: int) -> None:
+        super().__init__(f"Unit rejected write to register {address} with exception code {code}")
+        self.code = code
+
+
+class TransactionQueue:
+    """Exclusive, priority-ordered access to the serial bus.
+
+    Waiters are granted the bus lowest priority value first, FIFO within a
+    priority. Long holders (the poll sweep) check contended() between
+    transactions and yield() so writes and gateway requests are not stuck
+    behind a whole cycle.
+    """
+
+    def __init__(self) -> None:
+        self._held = False
+        self._held_since = 0.0
+        self._busy = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    def busy_seconds(self) -> float:
+        """Return the total time the bus has been held, including the current holder."""
+        if self._held:
+            return self._busy + time.monotonic() - self._held_since
+        return self._busy
+
+    def locked(self) -> bool:
+        return self._held
+
+    def contended(self, priority: int) -> bool:
+        """Return True if someone with a more urgent priority is waiting."""
+        return any(waiter[0] < priority and not waiter[2].done() for waiter in self._waiters)
+
+    async def acquire(self, priority: int) -> None:
+        if not self._held and not self._waiters:
+            self._held = True
+            self._held_since = time.monotonic()
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            with tracing.span("bus.wait", priority=priority):
+                await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled; pass the bus on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        now = time.monotonic()
+        self._busy += now - self._held_since
+        self._held_since = now
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._held = False
+
+    async def yield_to(self, priority: int) -> None:
+        """Let more urgent waiters run, then take the bus back."""
+        if self.contended(priority):
+            self.release()
+            await self.acquire(priority)
+
+    @asynccontextmanager
+    async def claim(self, priority: int) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def create_client(config: dict, transport: str = TRANSPORT_PYMODBUS) -> Any:
+    """Create the configured Modbus client; call from the loop that will use it."""
+    if transport == TRANSPORT_NATIVE:
+        if rtu_available():
+            _LOGGER.debug("Creating native RTU client")
+            return RtuClient(
+                port=config["port"],
+                baudrate=config["baudrate"],
+                bytesize=config["bytesize"],
+                parity=config["parity"],
+                stopbits=config["stopbits"],
+            )
+        _LOGGER.warning("Native RTU transport needs pyserial-asyncio-fast; falling back to pymodbus")
+    from pymodbus.client import AsyncModbusSerialClient
+
+    _LOGGER.debug("Creating Modbus client")
+    return AsyncModbusSerialClient(
+        port=config["port"],
+        baudrate=config["baudrate"],
+        stopbits=config["stopbits"],
+        bytesize=config["bytesize"],
+        parity=config["parity"],
+    )
+
+
+class SAVEVSREngine:
+    """Poll, write and decode engine for one SAVE VSR unit.
+
+    All coroutines must run on a single event loop (the hub's Modbus worker);
+    the client is created lazily on that loop by client_factory.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any], stale_after: float) -> None:
+        self._client_factory = client_factory
+        self.client: Any = None
+        self._bus = TransactionQueue()
+        # Reads requested through read_registers() that are on the bus right now
+        self._inflight: dict[tuple[str, int, int], asyncio.Future] = {}
+
+        # Local mirror of raw registers; the single source of truth for entity values
+        self.image = RegisterImage()
+        self.stale_after = stale_after
+
+        # Cycle scheduling state: rotating start block for deferred reads and overrun counters
+        self._batch_cursor = 0
+        self._force_read: set[int] = set()
+        # Batches slowed down because nothing consumes their keys, and the resulting per-key intervals
+        self._slow_batches: frozenset[int] = frozenset()
+        self._slow_interval = 0.0
+        self.key_intervals: dict[str, float] = dict(KEY_INTERVALS)
+        # Optional volatility-driven intervals for the remaining batches
+        self.adaptive: AdaptiveScheduler | None = None
+        self._last_cycle_duration: float | None = None
+        self._overruns = 0
+        self._deferred_blocks = 0
+        self._merged_ticks = 0
+
+        # Measured bus occupancy since the previous cycle, and the planner's estimate for comparison
+        self._bus_load: float | None = None
+        self._bus_mark = (0.0, time.monotonic())
+        self.bus_estimate: dict[str, float] = {}
+
+        # Sampled span tracing (disabled unless the hub installs a configured tracer) and the
+        # latest sampled cycle, so the entity fan-out can be attached to it
+        self.tracer = Tracer()
+        self.last_trace: Span | None = None
+
+        # Consecutive heartbeat failures
+        self.offline_cycles = 0
+
+        # Last known raw state per alarm, transitions awaiting an event and the active set
+        self._alarm_states: dict[str, int] = {}
+        self._alarm_transitions: list[tuple[str, int, int]] = []
+        self._active_alarms: dict[str, str] = {}
+
+    @property
+    def cycle_stats(self) -> dict:
+        """Return scheduling counters for the poll cycle."""
+        return {
+            "cycle_duration": self._last_cycle_duration,
+            "cycle_overruns": self._overruns,
+            "deferred_blocks": self._deferred_blocks,
+            "merged_ticks": self._merged_ticks,
+            "bus_load": self._bus_load,
+        }
+
+    def count_merged_tick(self) -> None:
+        """Count a coordinator tick that shared the cycle already running instead of starting one."""
+        self._merged_ticks += 1
+
+    async def close(self) -> None:
+        """Close the Modbus client and the trace file."""
+        self.tracer.close()
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception as err:
+                _LOGGER.warning("Error closing Modbus client: %s", err)
+
+    async def _ensure_connected(self) -> None:
+        """Connect client if not connected."""
+        if self.client is None:
+            self.client = self._client_factory()
+        if not self.client.connected:
+            _LOGGER.debug("Connecting to Systemair SAVE VSR Modbus RTU...")
+            try:
+                connected = await asyncio.wait_for(self.client.connect(), timeout=5.0)
+            except asyncio.TimeoutError:
+                _LOGGER.error("Timeout connecting to Systemair SAVE VSR")
+                raise EngineError("Timeout connecting to Systemair SAVE VSR")
+            except Exception as err:
+                _LOGGER.error("Unexpected error connecting to Systemair SAVE VSR: %s", err)
+                raise EngineError(f"Unexpected error connecting: {err}")
+            if not connected:
+                _LOGGER.error("Failed to connect to Systemair SAVE VSR")
+                raise EngineError("Failed to connect to Systemair SAVE VSR")
+
+    async def _read_with_retry(
+        self, addr: int, count: int, reg_type: str, deadline: float, max_retries: int = 2
+    ) -> list[int] | None:
+        """Read a register block, retrying while the cycle deadline allows."""
+        loop = asyncio.get_running_loop()
+        with tracing.span("modbus.read", **{"modbus.type": reg_type, "modbus.address": addr, "modbus.count": count}) as read:
+            for attempt in range(max_retries):
+                timeout = min(READ_TIMEOUT_SECONDS, deadline - loop.time())
+                if timeout <= 0:
+                    read.fail("deadline")
+                    return None
+                read.set("retries", attempt)
+                with tracing.span("modbus.wire", attempt=attempt + 1) as wire:
+                    try:
+                        if reg_type == "holding":
+                            rr = await asyncio.wait_for(
+                                self.client.read_holding_registers(addr, count, slave=SLAVE_ID),
+                                timeout=timeout
+                            )
+                        else:
+                            rr = await asyncio.wait_for(
+                                self.client.read_input_registers(addr, count, slave=SLAVE_ID),
+                                timeout=timeout
+                            )
+                        if not rr.isError() and rr.registers and len(rr.registers) >= count:
+                            return rr.registers
+                        wire.fail("exception response")
+                        _LOGGER.warning("Failed to read %s registers at %s (attempt %s/%s)", reg_type, addr, attempt + 1, max_retries)
+                    except asyncio.TimeoutError:
+                        wire.fail("timeout")
+                        _LOGGER.warning("Timeout reading %s registers at %s (attempt %s/%s)", reg_type, addr, attempt + 1, max_retries)
+                    except ModbusException as err:
+                        wire.fail(str(err))
+                        _LOGGER.warning("Modbus error reading %s registers at %s (attempt %s/%s): %s", reg_type, addr, attempt + 1, max_retries, err)
+                    except Exception as err:
+                        wire.fail(str(err))
+                        _LOGGER.warning("Unexpected error reading %s registers at %s (attempt %s/%s): %s", reg_type, addr, attempt + 1, max_retries, err)
+                if attempt + 1 < max_retries and loop.time() + RETRY_DELAY_SECONDS < deadline:
+                    await asyncio.sleep(RETRY_DELAY_SECONDS)
+            read.fail("retries exhausted")
+            return None
+
+    def _is_due(self, index: int, batch: dict) -> bool:
+        """Return True if a batch should be read this cycle.
+
+        Batches without an interval are read every cycle; slower ones (the
+        countdowns, unobserved groups, adaptive batches that are quiet) only
+        when their interval elapsed or a resync was requested.
+        """
+        interval = batch.get("interval") or (self._slow_interval if index in self._slow_batches else None)
+        if not interval and self.adaptive is not None:
+            interval = self.adaptive.interval(index)
+        if not interval or index in self._force_read:
+            return True
+        oldest = self.image.oldest_read(batch["type"], batch["start"], batch["count"])
+        return oldest is None or time.monotonic() - oldest >= interval
+
+    def set_slow_batches(self, indices: frozenset[int], interval: float) -> None:
+        """Poll the given batches only every interval seconds; staleness limits follow."""
+        if indices == self._slow_batches and interval == self._slow_interval:
+            return
+        # Batches coming back to full rate are read on the next cycle
+        self._force_read.update(self._slow_batches - indices)
+        self._slow_batches = indices
+        self._slow_interval = interval
+        self._update_key_intervals()
+
+    def set_adaptive(self, min_interval: float, max_interval: float) -> None:
+        """Learn per-batch poll intervals from how fast their keys change, within the given bounds."""
+        self.adaptive = AdaptiveScheduler(min_interval, max_interval)
+        self._update_key_intervals()
+
+    def _update_key_intervals(self) -> None:
+        """Recompute the per-key intervals staleness is measured on top of."""
+        intervals = dict(KEY_INTERVALS)
+        if self.adaptive is not None:
+            intervals.update(self.adaptive.key_intervals())
+        for index in self._slow_batches:
+            for key in REGISTER_BATCHES[index]["keys"]:
+                if key:
+                    intervals[key] = max(intervals.get(key, 0), self._slow_interval)
+        self.key_intervals = intervals
+
+    def _reset_adaptive(self) -> None:
+        """Fall back to fast polling after a write or mode change, when values are expected to move."""
+        if self.adaptive is not None:
+            self.adaptive.reset(time.monotonic())
+            self._update_key_intervals()
+
+    def _request_countdown_resync(self) -> None:
+        """Re-read the countdown registers on the next cycle."""
+        self._force_read.update(COUNTDOWN_BATCHES)
+        self._reset_adaptive()
+
+    def poll_delay(self, interval: float, max_delay: float) -> float:
+        """Return the delay before the next cycle, backing off exponentially while the heartbeat fails."""
+        if not self.offline_cycles:
+            return interval
+        return min(interval * 2 ** min(self.offline_cycles, 10), max_delay)
+
+    def _measure_bus_load(self) -> None:
+        """Update the share of wall time the bus was held since the previous cycle."""
+        busy, now = self._bus.busy_seconds(), time.monotonic()
+        last_busy, last_now = self._bus_mark
+        if now > last_now:
+            self._bus_load = round(min(100.0, 100 * (busy - last_busy) / (now - last_now)), 1)
+        self._bus_mark = (busy, now)
+
+    def snapshot(self, online: bool) -> RegisterView:
+        """Build the published snapshot: a lazy view over a frozen copy of the register image.
+
+        The copy is taken here on the engine's loop, so the view handed to
+        Home Assistant never changes while later reads update the image.
+        """
+        extra = {
+            **self.cycle_stats,
+            "online": online,
+            "active_alarms": len(self._active_alarms),
+            "active_alarm_list": dict(self._active_alarms),
+            "bus_estimate": {
+                **self.bus_estimate,
+                "measured_cycle_seconds": self._last_cycle_duration,
+            },
+        }
+        return RegisterView(self.image.copy(), extra, self.stale_after, self.key_intervals)
+
+    async def current_snapshot(self) -> RegisterView:
+        """Return a snapshot of the image as it stands, e.g. after an on-demand read or a write."""
+        return self.snapshot(online=not self.offline_cycles)
+
+    def _update_alarms(self) -> None:
+        """Detect alarm state transitions in the register image.
+
+        The first value seen for an alarm only sets the baseline; later
+        changes are queued as (key, old, new) for take_alarm_transitions().
+        """
+        active: dict[str, str] = {}
+        for key in ALARM_KEYS:
+            reg_type, address, _, _ = KEY_MAP[key]
+            raw = self.image.get(reg_type, address)
+            if raw is None:
+                continue
+            old = self._alarm_states.get(key)
+            if old is not None and old != raw:
+                self._alarm_transitions.append((key, old, raw))
+            self._alarm_states[key] = raw
+            if raw and key not in ALARM_SUMMARY_KEYS:
+                active[key] = ALARM_STATE_MAP.get(raw, str(raw))
+        self._active_alarms = active
+
+    def take_alarm_transitions(self) -> list[tuple[str, int, int]]:
+        """Return and clear the alarm transitions detected since the last call."""
+        transitions, self._alarm_transitions = self._alarm_transitions, []
+        return transitions
+
+    async def poll(self) -> RegisterView:
+        """Read and decode register batches within the cycle budget; traced as one poll_cycle when sampled."""
+        with self.tracer.trace("poll_cycle") as cycle:
+            view = await self._sweep()
+            cycle.set("online", bool(view.get("online")))
+            cycle.set("deferred_blocks", self._deferred_blocks)
+        self.last_trace = cycle if isinstance(cycle, Span) else None
+        return view
+
+    async def _sweep(self) -> RegisterView:
+        """Read and decode register batches within the cycle budget.
+
+        A cheap heartbeat read comes first; when it fails, or the connection
+        is lost mid-sweep, the rest of the sweep is skipped and the last good
+        values are kept until they go stale. Blocks that do
+        not fit before the deadline are deferred: they keep their previous
+        values and are read first on the next cycle.
+        """
+        # Serialize updates to one at a time; more urgent requests cut in between blocks
+        async with self._bus.claim(PRIORITY_POLL):
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            deadline = started + CYCLE_BUDGET_SECONDS
+            try:
+                try:
+                    await self._ensure_connected()
+                    heartbeat = await self._read_with_retry(
+                        HEARTBEAT_BATCH["start"], HEARTBEAT_BATCH["count"], HEARTBEAT_BATCH["type"],
+                        started + HEARTBEAT_TIMEOUT_SECONDS, max_retries=1,
+                    )
+                except EngineError:
+                    heartbeat = None
+                if heartbeat is None:
+                    self.offline_cycles += 1
+                    self._last_cycle_duration = round(loop.time() - started, 3)
+                    self._measure_bus_load()
+                    _LOGGER.warning(
+                        "Systemair SAVE VSR heartbeat failed (%s in a row), skipping sweep",
+                        self.offline_cycles,
+                    )
+                    return self.snapshot(online=False)
+                if self.offline_cycles:
+                    _LOGGER.info("Systemair SAVE VSR is back online after %s failed heartbeats", self.offline_cycles)
+                self.offline_cycles = 0
+
+                mode_known = self.image.read_at(HEARTBEAT_BATCH["type"], HEARTBEAT_BATCH["start"]) is not None
+                if self.image.store(HEARTBEAT_BATCH["type"], HEARTBEAT_BATCH["start"], heartbeat) and mode_known:
+                    # User mode changed on the unit; its countdown restarted
+                    self._request_countdown_resync()
+
+                total = len(REGISTER_BATCHES)
+                adapted = False
+                deferred_at: int | None = None
+                deferred = 0
+                lost_at: int | None = None
+                for offset in range(total):
+                    index = (self._batch_cursor + offset) % total
+                    if loop.time() >= deadline:
+                        deferred_at, deferred = index, total - offset
+                        break
+
+                    batch = REGISTER_BATCHES[index]
+                    if batch is HEARTBEAT_BATCH or not self._is_due(index, batch):
+                        continue
+
+                    await self._bus.yield_to(PRIORITY_POLL)
+                    if loop.time() >= deadline:
+                        deferred_at, deferred = index, total - offset
+                        break
+                    try:
+                        await self._ensure_connected()
+                    except EngineError as err:
+                        # Adapter lost mid-sweep: keep the last good values and count the cycle as offline
+                        self.offline_cycles += 1
+                        lost_at = index
+                        _LOGGER.warning("Systemair SAVE VSR connection lost mid-sweep, skipping remaining blocks: %s", err)
+                        break
+
+                    registers = await self._read_with_retry(batch["start"], batch["count"], batch["type"], deadline)
+                    if registers is None:
+                        if loop.time() >= deadline:
+                            # Ran out of budget mid-read; retry this block first next cycle
+                            deferred_at, deferred = index, total - offset
+                            break
+                        # Keep the last good values; they expire through staleness
+                        continue
+
+                    self.image.store(batch["type"], batch["start"], registers)
+                    self._force_read.discard(index)
+                    if self.adaptive is not None and self.adaptive.observe(index, registers, time.monotonic()):
+                        adapted = True
+
+                if adapted:
+                    self._update_key_intervals()
+                if lost_at is not None:
+                    # Resume from the block that could not be read once the unit is back
+                    self._batch_cursor = lost_at
+                elif deferred_at is None:
+                    self._batch_cursor = 0
+                else:
+                    self._batch_cursor = deferred_at
+                    self._overruns += 1
+                    self._deferred_blocks += deferred
+                    _LOGGER.warning(
+                        "Poll cycle exceeded %.1fs budget, deferred %s of %s blocks to next cycle",
+                        CYCLE_BUDGET_SECONDS, deferred, total,
+                    )
+
+                with tracing.span("decode"):
+                    self._update_alarms()
+                    view = self.snapshot(online=lost_at is None)
+                self._last_cycle_duration = round(loop.time() - started, 3)
+                self._measure_bus_load()
+                return view
+            except ModbusException as err:
+                _LOGGER.error("Modbus error during update: %s", err)
+                raise EngineError(f"Modbus error: {err}")
+            except Exception as err:
+                _LOGGER.error("Unexpected error during update: %s", err)
+                raise EngineError(f"Unexpected error: {err}")
+            finally:
+                if self.client is not None:
+                    try:
+                        self.client.close()
+                    except Exception as err:
+                        _LOGGER.warning("Error closing Modbus client: %s", err)
+
+    async def write_register(self, address: int, value: int, slave: int = SLAVE_ID) -> bool:
+        """Write a single register; return False if the write may succeed on a retry.
+
+        Raises WriteRejected when the unit answers with an exception response.
+        """
+        read_at = self.image.read_at("holding", address)
+        if (
+            read_at is not None
+            and time.monotonic() - read_at <= WRITE_DEDUPE_SECONDS
+            and self.image.is_confirmed("holding", address, value)
+        ):
+            _LOGGER.debug("Register %s already holds %s, skipping write", address, value)
+            return True
+        with self.tracer.trace("modbus.write", **{"modbus.address": address}) as write:
+            async with self._bus.claim(PRIORITY_USER):
+                try:
+                    await self._ensure_connected()
+                    wr = await asyncio.wait_for(self.client.write_register(address, value, slave=slave), timeout=3.0)
+                except asyncio.TimeoutError:
+                    _LOGGER.error("Modbus write timeout at address %s (no response for 3 seconds)", address)
+                    write.fail("timeout")
+                    return False
+                except ModbusException as err:
+                    _LOGGER.error("Modbus exception during write at address %s: %s", address, err)
+                    write.fail(str(err))
+                    return False
+                except (ConnectionError, OSError) as err:
+                    # The native RTU transport reports a lost port as a plain OS error
+                    _LOGGER.error("Connection error during write at address %s: %s", address, err)
+                    write.fail(str(err))
+                    return False
+                except Exception as err:
+                    _LOGGER.error("Unexpected error during write at address %s: %s", address, err)
+                    write.fail(str(err))
+                    return False
+                if wr.isError():
+                    code = getattr(wr, "exception_code", None)
+                    write.fail(f"exception response {code}")
+                    if isinstance(code, int) and code > 0:
+                        # A real exception response, not a garbled frame
+                        raise WriteRejected(address, code)
+                    _LOGGER.error("Modbus write error at address %s", address)
+                    return False
+                self.image.mark_written(address, value)
+                if address in MODE_COMMAND_REGISTERS:
+                    self._request_countdown_resync()
+                else:
+                    self._reset_adaptive()
+                return True
+
+    async def _read_range(self, reg_type: str, start: int, count: int, deadline: float) -> bool:
+        """Read a contiguous range into the image using as few requests as possible."""
+        for chunk_start in range(start, start + count, MAX_READ_REGISTERS):
+            chunk = min(MAX_READ_REGISTERS, start + count - chunk_start)
+            registers = await self._read_with_retry(chunk_start, chunk, reg_type, deadline)
+            if registers is None:
+                return False
+            self.image.store(reg_type, chunk_start, registers)
+        return True
+
+    async def _write_range(self, address: int, values: list[int], slave: int = SLAVE_ID) -> bool:
+        """Write a contiguous holding range with FC16 and record it in the image."""
+        for offset in range(0, len(values), MAX_WRITE_REGISTERS):
+            chunk = values[offset:offset + MAX_WRITE_REGISTERS]
+            try:
+                wr = await asyncio.wait_for(
+                    self.client.write_registers(address + offset, chunk, slave=slave), timeout=READ_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                _LOGGER.error("Modbus write timeout at address %s (%s registers)", address + offset, len(chunk))
+                return False
+            except ModbusException as err:
+                _LOGGER.error("Modbus exception during write at address %s: %s", address + offset, err)
+                return False
+            except (ConnectionError, OSError) as err:
+                _LOGGER.error("Connection error during write at address %s: %s", address + offset, err)
+                return False
+            if wr.isError():
+                _LOGGER.error("Modbus write error at address %s (%s registers)", address + offset, len(chunk))
+                return False
+            for index, value in enumerate(chunk):
+                self.image.mark_written(address + offset + index, value)
+        self._reset_adaptive()
+        return True
+
+    async def _ensure_schedule(self, refresh: bool, deadline: float) -> list[int]:
+        """Return the raw schedule block, reading it only when the cache is missing or old."""
+        oldest = self.image.oldest_read("holding", SCHEDULE_START, SCHEDULE_COUNT)
+        if refresh or oldest is None or time.monotonic() - oldest > SCHEDULE_CACHE_SECONDS:
+            if not await self._read_range("holding", SCHEDULE_START, SCHEDULE_COUNT, deadline):
+                raise EngineError("Failed to read week schedule")
+        return self.image.block("holding", SCHEDULE_START, SCHEDULE_COUNT)
+
+    async def get_week_schedule(self, refresh: bool = False) -> dict:
+        """Return the unit's week schedule, served from the register image when fresh."""
+        async with self._bus.claim(PRIORITY_USER):
+            await self._ensure_connected()
+            deadline = asyncio.get_running_loop().time() + BULK_TIMEOUT_SECONDS
+            return decode_schedule(await self._ensure_schedule(refresh, deadline))
+
+    async def set_week_schedule(self, schedule: dict) -> int:
+        """Apply schedule edits, writing only the changed register ranges; return registers written."""
+        async with self._bus.claim(PRIORITY_USER):
+            await self._ensure_connected()
+            deadline = asyncio.get_running_loop().time() + BULK_TIMEOUT_SECONDS
+            current = await self._ensure_schedule(False, deadline)
+            desired = encode_schedule(schedule, current)
+            written = 0
+            for address, values in changed_ranges(SCHEDULE_START, current, desired):
+                if not await self._write_range(address, values):
+                    raise EngineError(f"Failed to write week schedule at register {address}")
+                written += len(values)
+            _LOGGER.debug("Week schedule updated, %s registers written", written)
+            return written
+
+    async def _read_config(self, addresses: Iterable[int], max_age: float, deadline: float) -> dict[int, int | None]:
+        """Return holding registers, re-reading the coalesced ranges older than max_age."""
+        values: dict[int, int | None] = {}
+        for reg_type, start, count in coalesce_registers(("holding", address) for address in addresses):
+            oldest = self.image.oldest_read(reg_type, start, count)
+            if oldest is None or time.monotonic() - oldest > max_age:
+                if not await self._read_range(reg_type, start, count, deadline):
+                    raise EngineError(f"Failed to read {count} registers at {start}")
+            values.update(zip(range(start, start + count), self.image.block(reg_type, start, count)))
+        return values
+
+    async def read_config(self) -> dict[int, int]:
+        """Read the unit's configuration registers fresh from the unit, in coalesced reads."""
+        async with self._bus.claim(PRIORITY_USER):
+            await self._ensure_connected()
+            deadline = asyncio.get_running_loop().time() + BULK_TIMEOUT_SECONDS
+            values = await self._read_config(CONFIG_REGISTERS, 0, deadline)
+        return {address: values[address] for address in CONFIG_REGISTERS}
+
+    async def apply_config(self, snapshot: dict[int, int]) -> dict[str, Any]:
+        """Bring the unit to a configuration snapshot, writing only what differs.
+
+        The diff is taken against the register image (re-reading ranges
+        older than CONFIG_CACHE_SECONDS), changed runs go out as FC16
+        writes, and one verify pass reads the written ranges back.
+        """
+        unknown = sorted(set(snapshot).difference(CONFIG_REGISTERS))
+        if unknown:
+            raise ValueError(f"Not configuration registers: {', '.join(map(str, unknown))}")
+        if any(not 0 <= value <= 0xFFFF for value in snapshot.values()):
+            raise ValueError("Register values must be between 0 and 65535")
+        async with self._bus.claim(PRIORITY_USER):
+            await self._ensure_connected()
+            deadline = asyncio.get_running_loop().time() + BULK_TIMEOUT_SECONDS
+            current = await self._read_config(snapshot, CONFIG_CACHE_SECONDS, deadline)
+            writes = plan_config_writes(snapshot, current)
+            for address, values in writes:
+                if not await self._write_range(address, values):
+                    raise EngineError(f"Failed to write {len(values)} registers at {address}")
+            written = [address + offset for address, values in writes for offset in range(len(values))]
+            mismatched: list[int] = []
+            if written:
+                verified = await self._read_config(written, 0, deadline)
+                mismatched = [address for address in written if verified[address] != snapshot[address]]
+        if MODE_COMMAND_REGISTERS.intersection(written):
+            self._request_countdown_resync()
+        _LOGGER.debug("Configuration applied: %s registers in %s writes", len(written), len(writes))
+        return {"registers_written": len(written), "write_transactions": len(writes), "mismatched": mismatched}
+
+    def fresh_block(self, reg_type: str, address: int, count: int, max_age: float) -> list[int] | None:
+        """Return a range from the image if every register was read within max_age seconds."""
+        oldest = self.image.oldest_read(reg_type, address, count)
+        if oldest is None or time.monotonic() - oldest > max_age:
+            return None
+        return self.image.block(reg_type, address, count)
+
+    async def read_registers(
+        self, reg_type: str, address: int, count: int, max_age: float, priority: int = PRIORITY_GATEWAY
+    ) -> list[int]:
+        """Return registers from the image when fresh enough, otherwise read them from the unit.
+
+        Concurrent requests for the same range share one bus transaction.
+        """
+        cached = self.fresh_block(reg_type, address, count, max_age)
+        if cached is not None:
+            return cached
+        key = (reg_type, address, count)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = self._inflight[key] = asyncio.ensure_future(
+                self._read_through(reg_type, address, count, max_age, priority)
+            )
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _read_through(self, reg_type: str, address: int, count: int, max_age: float, priority: int) -> list[int]:
+        with self.tracer.trace("modbus.read_through", **{"modbus.type": reg_type, "modbus.address": address}):
+            async with self._bus.claim(priority):
+                # The poll sweep may have refreshed the range while we waited for the bus
+                cached = self.fresh_block(reg_type, address, count, max_age)
+                if cached is not None:
+                    return cached
+                await self._ensure_connected()
+                deadline = asyncio.get_running_loop().time() + READ_TIMEOUT_SECONDS
+                registers = await self._read_with_retry(address, count, reg_type, deadline, max_retries=1)
+                if registers is None:
+                    raise EngineError(f"Failed to read {count} {reg_type} registers at {address}")
+                registers = registers[:count]
+                self.image.store(reg_type, address, registers)
+                return registers
+
+    async def read_keys(self, keys: Iterable[str], max_age: float = ON_DEMAND_MAX_AGE_SECONDS) -> int:
+        """Refresh only the registers behind keys, coalesced into as few reads as possible.
+
+        Runs at user priority next to the regular sweep without touching its
+        schedule; returns the number of ranges requested.
+        """
+        ranges = coalesce_registers(KEY_MAP[key][:2] for key in keys if key in KEY_MAP)
+        mode_ref = (HEARTBEAT_BATCH["type"], HEARTBEAT_BATCH["start"])
+        mode = self.image.get(*mode_ref)
+        with self.tracer.trace("refresh_keys", ranges=len(ranges)):
+            await asyncio.gather(
+                *(self.read_registers(reg_type, start, count, max_age, PRIORITY_USER) for reg_type, start, count in ranges)
+            )
+        if mode is not None and self.image.get(*mode_ref) != mode:
+            self._request_countdown_resync()
+        return len(ranges)
+
+    async def read_alarm_log(self, cursor: list[int] | None) -> tuple[list[list[int]], list[int] | None]:
+        """Return raw alarm log entries newer than cursor (newest first) and the new cursor.
+
+        The newest entry is read alone first, so an unchanged log costs one
+        small request; only when it differs are the following entries fetched
+        in coalesced reads until the cursor entry or an empty slot is reached.
+        """
+        per_entry = ALARM_LOG_REGS_PER_ENTRY
+        new: list[list[int]] = []
+        async with self._bus.claim(PRIORITY_POLL):
+            await self._ensure_connected()
+            deadline = asyncio.get_running_loop().time() + BULK_TIMEOUT_SECONDS
+            index, chunk = 0, 1
+            while index < ALARM_LOG_ENTRIES:
+                count = min(chunk, ALARM_LOG_ENTRIES - index)
+                start = ALARM_LOG_START + index * per_entry
+                if not await self._read_range("holding", start, count * per_entry, deadline):
+                    raise EngineError("Failed to read alarm log")
+                block = self.image.block("holding", start, count * per_entry)
+                for offset in range(count):
+                    entry = block[offset * per_entry:(offset + 1) * per_entry]
+                    if entry == cursor or not entry[0]:
+                        return new, new[0] if new else cursor
+                    new.append(entry)
+                index += count
+                chunk = ALARM_LOG_READ_ENTRIES
+        return new, new[0] if new else cursor
+
+    async def write_registers(self, address: int, values: list[int], slave: int = SLAVE_ID) -> bool:
+        """Write a contiguous holding range with FC16."""
+        async with self._bus.claim(PRIORITY_USER):
+            try:
+                await self._ensure_connected()
+            except EngineError:
+                return False
+            if not await self._write_range(address, values, slave):
+                return False
+        if MODE_COMMAND_REGISTERS.intersection(range(address, address + len(values))):
+            self._request_countdown_resync()
+        return True
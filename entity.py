@@ -0,0 +1,38 @@
+"""Shared entity behaviour for Systemair SAVE VSR platforms."""
+from __future__ import annotations
+
+import logging
+
+from .registers import KEY_MAP
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SAVEVSRRefreshMixin:
+    """Make homeassistant.update_entity read only the registers an entity depends on.
+
+    Entities list their coordinator keys in refresh_keys; an on-demand update
+    reads just those registers through the hub instead of requesting a full
+    coordinator sweep, and the regular poll schedule is left alone. Entities
+    whose keys are not register-backed fall back to a coordinator refresh;
+    entities without keys ignore the update.
+    """
+
+    refresh_keys: tuple[str, ...] = ()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        observers = self.hub.observers
+        if observers is not None:
+            # Lets observer-aware polling map this entity's consumers to its registers
+            observers.register(self.entity_id, self.refresh_keys)
+            self.async_on_remove(lambda: observers.unregister(self.entity_id))
+
+    async def async_update(self) -> None:
+        if not self.enabled or not self.refresh_keys:
+            return
+        keys = [key for key in self.refresh_keys if key in KEY_MAP]
+        if not keys:
+            await super().async_update()
+            return
+        await self.hub.async_refresh_keys(keys)
@@ -0,0 +1,162 @@
+"""Embedded Modbus TCP gateway onto the hub's serial bus.
+
+Commissioning tools and building management systems connect over Modbus TCP
+while the integration keeps the RTU port. Reads are answered from the
+register image when it is fresh enough; cache misses and writes go through
+the engine's priority transaction queue, so external clients share the bus
+with the poll sweep without collisions and identical concurrent reads hit
+the unit only once.
+
+Modbus TCP has no authentication: anyone who can reach the listening
+address can read the unit, and write to it unless the gateway is read-only.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+from .const import SERVER_CLOSE_TIMEOUT_SECONDS, SLAVE_ID
+from .engine import EngineError, SAVEVSREngine, WriteRejected
+from .registers import MAX_READ_REGISTERS, MAX_WRITE_REGISTERS
+
+_LOGGER = logging.getLogger(__name__)
+
+FC_READ_HOLDING = 0x03
+FC_READ_INPUT = 0x04
+FC_WRITE_SINGLE = 0x06
+FC_WRITE_MULTIPLE = 0x10
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+SLAVE_DEVICE_FAILURE = 0x04
+GATEWAY_TARGET_FAILED = 0x0B
+
+_MBAP = struct.Struct(">HHHB")
+
+
+def _exception(function: int, code: int) -> bytes:
+    return bytes((function | 0x80, code))
+
+
+class ModbusTcpGateway:
+    """Modbus TCP server that multiplexes external clients onto one SAVE VSR unit."""
+
+    def __init__(self, engine: SAVEVSREngine, host: str, port: int, max_age: float, read_only: bool = False) -> None:
+        self._engine = engine
+        self._host = host
+        self._port = port
+        self._max_age = max_age
+        self._read_only = read_only
+        self._server: asyncio.base_events.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+        self.stats = {"requests": 0, "cache_hits": 0, "bus_reads": 0, "writes": 0, "errors": 0}
+
+    async def start(self) -> None:
+        """Start listening; run on the loop that owns the engine."""
+        self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+        _LOGGER.info(
+            "Modbus TCP gateway listening on %s:%s (%s)",
+            self._host, self._port, "read-only" if self._read_only else "reads and writes",
+        )
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        # Since Python 3.12.1 wait_closed() also waits for open connections, so drop them first
+        tasks = list(self._connections)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._connections.clear()
+        try:
+            await asyncio.wait_for(self._server.wait_closed(), SERVER_CLOSE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Modbus TCP gateway did not close within %ss", SERVER_CLOSE_TIMEOUT_SECONDS)
+        self._server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        peer = writer.get_extra_info("peername")
+        _LOGGER.debug("Gateway client %s connected", peer)
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP.size)
+                transaction, protocol, length, unit = _MBAP.unpack(header)
+                if protocol != 0 or not 2 <= length <= 254:
+                    _LOGGER.debug("Dropping gateway client %s after malformed header", peer)
+                    return
+                pdu = await reader.readexactly(length - 1)
+                response = await self.handle_pdu(pdu)
+                writer.write(_MBAP.pack(transaction, 0, len(response) + 1, unit) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            _LOGGER.debug("Gateway client %s disconnected", peer)
+
+    async def handle_pdu(self, pdu: bytes) -> bytes:
+        """Answer one request PDU with a response or exception PDU."""
+        self.stats["requests"] += 1
+        function = pdu[0]
+        try:
+            if function in (FC_READ_HOLDING, FC_READ_INPUT):
+                return await self._read(function, pdu)
+            if self._read_only and function in (FC_WRITE_SINGLE, FC_WRITE_MULTIPLE):
+                return _exception(function, ILLEGAL_FUNCTION)
+            if function == FC_WRITE_SINGLE:
+                return await self._write_single(pdu)
+            if function == FC_WRITE_MULTIPLE:
+                return await self._write_multiple(pdu)
+            return _exception(function, ILLEGAL_FUNCTION)
+        except struct.error:
+            return _exception(function, ILLEGAL_DATA_VALUE)
+        except WriteRejected as err:
+            # Relay the unit's own exception code
+            return _exception(function, err.code)
+        except EngineError as err:
+            self.stats["errors"] += 1
+            _LOGGER.debug("Gateway request failed: %s", err)
+            return _exception(function, GATEWAY_TARGET_FAILED)
+        except Exception as err:  # noqa: BLE001
+            self.stats["errors"] += 1
+            _LOGGER.warning("Unexpected error handling gateway request: %s", err)
+            return _exception(function, SLAVE_DEVICE_FAILURE)
+
+    async def _read(self, function: int, pdu: bytes) -> bytes:
+        address, count = struct.unpack_from(">HH", pdu, 1)
+        if not 1 <= count <= MAX_READ_REGISTERS:
+            return _exception(function, ILLEGAL_DATA_VALUE)
+        if address + count > 0x10000:
+            return _exception(function, ILLEGAL_DATA_ADDRESS)
+        reg_type = "holding" if function == FC_READ_HOLDING else "input"
+        registers = self._engine.fresh_block(reg_type, address, count, self._max_age)
+        if registers is not None:
+            self.stats["cache_hits"] += 1
+        else:
+            self.stats["bus_reads"] += 1
+            registers = await self._engine.read_registers(reg_type, address, count, self._max_age)
+        return struct.pack(f">BB{count}H", function, 2 * count, *registers)
+
+    async def _write_single(self, pdu: bytes) -> bytes:
+        address, value = struct.unpack_from(">HH", pdu, 1)
+        self.stats["writes"] += 1
+        if not await self._engine.write_register(address, value, SLAVE_ID):
+            raise EngineError(f"Write to register {address} failed")
+        return pdu[:5]
+
+    async def _write_multiple(self, pdu: bytes) -> bytes:
+        address, count, byte_count = struct.unpack_from(">HHB", pdu, 1)
+        if not 1 <= count <= MAX_WRITE_REGISTERS or byte_count != 2 * count or len(pdu) < 6 + byte_count:
+            return _exception(FC_WRITE_MULTIPLE, ILLEGAL_DATA_VALUE)
+        values = list(struct.unpack_from(f">{count}H", pdu, 6))
+        self.stats["writes"] += 1
+        if not await self._engine.write_registers(address, values, SLAVE_ID):
+            raise EngineError(f"Write to registers {address}-{address + count - 1} failed")
+        return pdu[:5]
@@ -0,0 +1,630 @@
+"""Hub and poll coordinator for Systemair SAVE VSR."""
+from __future__ import annotations
+
+import logging
+import asyncio
+import time
+from datetime import datetime, timedelta
+from collections.abc import Callable
+from functools import partial
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    UPDATE_INTERVAL_SECONDS,
+    SLAVE_ID,
+    PRIORITY_USER,
+    BACKOFF_MAX_SECONDS,
+    CONF_STALE_AFTER,
+    DEFAULT_STALE_AFTER_SECONDS,
+    EVENT_ALARM,
+    EVENT_ALARM_LOG,
+    ALARM_LOG_INTERVAL_SECONDS,
+    ALARM_LOG_STORAGE_VERSION,
+    CONF_TRANSPORT,
+    TRANSPORT_PYMODBUS,
+    CONF_PUBLISH,
+    CONF_PUBLISH_TARGET,
+    CONF_PUBLISH_FORMAT,
+    PUBLISH_NONE,
+    PUBLISH_MQTT,
+    PUBLISH_UNIX,
+    PUBLISH_FORMAT_JSON,
+    DEFAULT_PUBLISH_TOPIC,
+    DEFAULT_PUBLISH_SOCKET,
+    CONF_GATEWAY_PORT,
+    DEFAULT_GATEWAY_PORT,
+    CONF_GATEWAY_MAX_AGE,
+    DEFAULT_GATEWAY_MAX_AGE_SECONDS,
+    CONF_GATEWAY_HOST,
+    DEFAULT_GATEWAY_HOST,
+    CONF_GATEWAY_READ_ONLY,
+    DEFAULT_GATEWAY_READ_ONLY,
+    CONF_CONTROLLER,
+    CONF_CONTROL_TEMP_MEDIUM,
+    CONF_CONTROL_TEMP_HIGH,
+    CONF_CONTROL_HUMIDITY_ENTITY,
+    CONF_CONTROL_HUMIDITY_MEDIUM,
+    CONF_CONTROL_HUMIDITY_HIGH,
+    CONF_CONTROL_MIN_DWELL,
+    DEFAULT_CONTROL_TEMP_MEDIUM,
+    DEFAULT_CONTROL_TEMP_HIGH,
+    DEFAULT_CONTROL_HUMIDITY_MEDIUM,
+    DEFAULT_CONTROL_HUMIDITY_HIGH,
+    DEFAULT_CONTROL_MIN_DWELL_SECONDS,
+    CONTROL_HYSTERESIS,
+    CONTROL_MAX_WRITES_PER_HOUR,
+    BUS_LOAD_WARN_PERCENT,
+    CONF_IMPORT_STATISTICS,
+    CONF_STATISTICS_ONLY,
+    STATISTICS_STORAGE_VERSION,
+    CONF_OBSERVER_POLLING,
+    JOURNAL_EXPIRY_SECONDS,
+    JOURNAL_MAX_ATTEMPTS,
+    JOURNAL_STORAGE_VERSION,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_TRACE_SAMPLE_RATE,
+    CONFIG_SNAPSHOT_VERSION,
+    CONF_ADAPTIVE_POLLING,
+    CONF_ADAPTIVE_MIN_INTERVAL,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_MIN_INTERVAL_SECONDS,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL_SECONDS,
+    TRACE_FILE,
+    TRACE_MAX_BYTES,
+    TRACE_BACKUP_COUNT,
+)
+from .busmodel import estimate_cycle
+from .controller import DemandController, DemandInput
+from .engine import EngineError, SAVEVSREngine, WriteRejected, create_client
+from .gateway import ModbusTcpGateway
+from .journal import WriteJournal
+from .observers import ObserverTracker
+from .publisher import DeltaEncoder, MqttPublisher, UnixSocketPublisher
+from .registers import ALARM_STATE_MAP, CONFIG_KEYS, KEY_MAP, RegisterView, decode_alarm_log_entry
+from .aggregator import StatisticsAggregator, async_import_hourly
+from .tracing import Tracer
+from .worker import ModbusWorker
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SAVEVSRCoordinator(DataUpdateCoordinator[RegisterView]):
+    """Coordinator that adds the entity fan-out to the trace of a sampled poll cycle."""
+
+    def __init__(self, hub: SAVEVSRHub, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.hub = hub
+
+    @callback
+    def async_update_listeners(self) -> None:
+        cycle = self.hub.engine.last_trace
+        if cycle is None:
+            super().async_update_listeners()
+            return
+        self.hub.engine.last_trace = None
+        fan_out = cycle.child("entity_fan_out", listeners=len(self._listeners))
+        super().async_update_listeners()
+        # The span is exported on the worker, which owns the tracer and its file
+        self.hub.run_on_worker(fan_out.finish, time.time_ns())
+
+
+class SAVEVSRHub:
+    """Hub for Systemair SAVE VSR Modbus communication.
+
+    Wraps the HA-independent SAVEVSREngine: the engine runs on a dedicated
+    Modbus worker thread, the hub feeds its snapshots to the coordinator and
+    turns its results into HA events and poll intervals.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self.entry = entry
+
+        # The client is created lazily on the worker loop so its serial
+        # transport is bound to the worker thread, never to the HA loop.
+        self.engine = SAVEVSREngine(
+            partial(create_client, dict(entry.data), entry.options.get(CONF_TRANSPORT, TRANSPORT_PYMODBUS)),
+            entry.options.get(CONF_STALE_AFTER, DEFAULT_STALE_AFTER_SECONDS),
+        )
+        self.engine.bus_estimate = estimate_cycle(entry.data, UPDATE_INTERVAL_SECONDS)
+        if self.engine.bus_estimate["estimated_load"] > BUS_LOAD_WARN_PERCENT:
+            _LOGGER.warning(
+                "Register plan needs about %.0f%% of the bus at %s baud; expect timeouts and deferred blocks",
+                self.engine.bus_estimate["estimated_load"], entry.data["baudrate"],
+            )
+        if entry.options.get(CONF_ADAPTIVE_POLLING, False):
+            self.engine.set_adaptive(
+                entry.options.get(CONF_ADAPTIVE_MIN_INTERVAL, DEFAULT_ADAPTIVE_MIN_INTERVAL_SECONDS),
+                entry.options.get(CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL_SECONDS),
+            )
+        sample_rate = float(entry.options.get(CONF_TRACE_SAMPLE_RATE, DEFAULT_TRACE_SAMPLE_RATE)) / 100
+        if sample_rate:
+            # Spans are written from the worker thread, never from the HA loop
+            self.engine.tracer = Tracer(
+                hass.config.path(TRACE_FILE),
+                sample_rate,
+                TRACE_MAX_BYTES,
+                TRACE_BACKUP_COUNT,
+                {"service.instance.id": entry.entry_id},
+            )
+        # Started from async_setup_entry so waiting for its loop never blocks the HA loop
+        self._worker = ModbusWorker(f"save_vsr_modbus_{entry.entry_id}")
+
+        self._device_info = dr.DeviceInfo(
+            identifiers={(DOMAIN, "save_vsr_device")},
+            name="SAVE VSR Ventilation Unit",
+            manufacturer="Systemair",
+            model="SAVE VSR500",
+        )
+
+        dev_reg = dr.async_get(hass)
+        self._device_id = dev_reg.async_get_or_create(config_entry_id=entry.entry_id, **self._device_info).id
+
+        self.coordinator = SAVEVSRCoordinator(
+            self,
+            hass,
+            _LOGGER,
+            name="save_vsr_coordinator",
+            config_entry=entry,
+            update_method=self._async_update_data,
+            update_interval=timedelta(seconds=UPDATE_INTERVAL_SECONDS),
+        )
+
+        # The in-flight poll cycle, shared by ticks that arrive while it runs
+        self._cycle: asyncio.Future | None = None
+
+        # Writes the unit has not confirmed, persisted and replayed once the heartbeat is healthy
+        self.journal = WriteJournal(JOURNAL_EXPIRY_SECONDS, JOURNAL_MAX_ATTEMPTS)
+        self._journal_store: Store = Store(hass, JOURNAL_STORAGE_VERSION, f"{DOMAIN}.write_journal.{entry.entry_id}")
+
+        # Newest alarm log entry already reported (None while the log is empty), and whether the
+        # first sync has backfilled the log; an empty log leaves no cursor to tell that apart
+        self._alarm_log_cursor: list[int] | None = None
+        self._alarm_log_synced = False
+        self._alarm_log_store: Store = Store(hass, ALARM_LOG_STORAGE_VERSION, f"{DOMAIN}.alarm_log.{entry.entry_id}")
+        self._alarm_log_due = 0.0
+
+        # Optional snapshot delta publishing; the socket server lives on the worker loop
+        self._mqtt_publisher: MqttPublisher | None = None
+        self._socket_publisher: UnixSocketPublisher | None = None
+        publish = entry.options.get(CONF_PUBLISH, PUBLISH_NONE)
+        if publish != PUBLISH_NONE:
+            encoder = DeltaEncoder(entry.entry_id, entry.options.get(CONF_PUBLISH_FORMAT, PUBLISH_FORMAT_JSON))
+            target = entry.options.get(CONF_PUBLISH_TARGET)
+            if publish == PUBLISH_MQTT:
+                self._mqtt_publisher = MqttPublisher(hass, target or DEFAULT_PUBLISH_TOPIC, encoder)
+            elif publish == PUBLISH_UNIX:
+                self._socket_publisher = UnixSocketPublisher(target or hass.config.path(DEFAULT_PUBLISH_SOCKET), encoder)
+
+        # Optional Modbus TCP gateway for external clients, served from the worker loop
+        self._gateway: ModbusTcpGateway | None = None
+        gateway_port = int(entry.options.get(CONF_GATEWAY_PORT, DEFAULT_GATEWAY_PORT))
+        if gateway_port:
+            self._gateway = ModbusTcpGateway(
+                self.engine,
+                entry.options.get(CONF_GATEWAY_HOST) or DEFAULT_GATEWAY_HOST,
+                gateway_port,
+                entry.options.get(CONF_GATEWAY_MAX_AGE, DEFAULT_GATEWAY_MAX_AGE_SECONDS),
+                entry.options.get(CONF_GATEWAY_READ_ONLY, DEFAULT_GATEWAY_READ_ONLY),
+            )
+
+        # Optional in-memory statistics, imported hourly instead of compiled from every state write
+        self.statistics: StatisticsAggregator | None = None
+        if entry.options.get(CONF_IMPORT_STATISTICS, False):
+            self.statistics = StatisticsAggregator()
+        # Hour in progress, saved on unload only once restored (a failed setup must not overwrite it)
+        self._statistics_store: Store = Store(hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.statistics.{entry.entry_id}")
+        self._statistics_loaded = False
+        self.statistics_only = self.statistics is not None and entry.options.get(CONF_STATISTICS_ONLY, False)
+
+        # Optional observer-aware polling: batches nobody consumes drop to a background rate
+        self.observers: ObserverTracker | None = None
+        if entry.options.get(CONF_OBSERVER_POLLING, False):
+            self.observers = ObserverTracker(hass, self)
+
+        # Optional local demand controller for the manual fan speed
+        self._controller: DemandController | None = None
+        self._humidity_entity: str | None = entry.options.get(CONF_CONTROL_HUMIDITY_ENTITY)
+        if entry.options.get(CONF_CONTROLLER, False):
+            inputs = {
+                "temp_extract": DemandInput(
+                    entry.options.get(CONF_CONTROL_TEMP_MEDIUM, DEFAULT_CONTROL_TEMP_MEDIUM),
+                    entry.options.get(CONF_CONTROL_TEMP_HIGH, DEFAULT_CONTROL_TEMP_HIGH),
+                ),
+            }
+            if self._humidity_entity:
+                inputs["humidity"] = DemandInput(
+                    entry.options.get(CONF_CONTROL_HUMIDITY_MEDIUM, DEFAULT_CONTROL_HUMIDITY_MEDIUM),
+                    entry.options.get(CONF_CONTROL_HUMIDITY_HIGH, DEFAULT_CONTROL_HUMIDITY_HIGH),
+                )
+            self._controller = DemandController(
+                inputs,
+                CONTROL_HYSTERESIS,
+                entry.options.get(CONF_CONTROL_MIN_DWELL, DEFAULT_CONTROL_MIN_DWELL_SECONDS),
+                CONTROL_MAX_WRITES_PER_HOUR,
+            )
+
+    @property
+    def device_info(self) -> dr.DeviceInfo:
+        return self._device_info
+
+    def key_age(self, key: str) -> float | None:
+        """Return seconds since the key's register was last read, or None if never read."""
+        data = self.coordinator.data
+        return data.key_age(key) if data is not None else None
+
+    def is_key_available(self, key: str) -> bool:
+        """Return False once a register-backed key is older than the staleness limit."""
+        data = self.coordinator.data
+        return data is not None and data.is_key_available(key)
+
+    async def async_start_worker(self) -> None:
+        """Start the Modbus worker thread and its event loop."""
+        await self._worker.start()
+
+    async def async_load_journal(self) -> None:
+        """Restore writes queued before a restart."""
+        self.journal.load(await self._journal_store.async_load())
+        if self.journal:
+            _LOGGER.info("%s queued write(s) restored, replaying once the unit is online", len(self.journal))
+
+    async def async_load_statistics(self) -> None:
+        """Restore the hourly statistics in progress before a restart; import hours that ended meanwhile."""
+        if self.statistics is None:
+            return
+        completed = self.statistics.load(await self._statistics_store.async_load(), time.time())
+        self._statistics_loaded = True
+        if completed:
+            async_import_hourly(self.hass, self.entry.entry_id, self.statistics, completed)
+
+    def _save_journal(self) -> None:
+        self._journal_store.async_delay_save(self.journal.as_dict, 1)
+
+    async def async_load_alarm_log_cursor(self) -> None:
+        """Restore the newest alarm log entry reported before a restart."""
+        data = await self._alarm_log_store.async_load()
+        if data:
+            self._alarm_log_cursor = data.get("cursor")
+            # Stores saved before the marker existed only had a cursor after a sync
+            self._alarm_log_synced = data.get("synced", self._alarm_log_cursor is not None)
+
+    async def async_start_servers(self) -> None:
+        """Start the snapshot socket and Modbus TCP gateway on the worker loop, if configured."""
+        if self._socket_publisher is not None:
+            try:
+                await self._worker.run(self._socket_publisher.start())
+            except OSError as err:
+                _LOGGER.error("Cannot open snapshot socket, publishing disabled: %s", err)
+                self._socket_publisher = None
+        if self._gateway is not None:
+            try:
+                await self._worker.run(self._gateway.start())
+            except OSError as err:
+                _LOGGER.error("Cannot start Modbus TCP gateway: %s", err)
+                self._gateway = None
+
+    def internal_keys(self) -> set[str]:
+        """Return keys the hub itself consumes (controller inputs, aggregated statistics)."""
+        keys: set[str] = set()
+        if self._controller is not None:
+            keys.update(self._controller.inputs)
+        if self.statistics is not None:
+            keys.update(self.statistics.keys)
+        return keys
+
+    def run_on_worker(self, func: Callable[..., object], *args: object) -> None:
+        """Schedule a plain callback on the Modbus worker loop; dropped once the worker has stopped."""
+        loop = self._worker.loop
+        if loop is None:
+            _LOGGER.debug("Modbus worker is not running, dropping %s", func)
+            return
+        try:
+            loop.call_soon_threadsafe(func, *args)
+        except RuntimeError:
+            # The loop closed between the check and the call
+            _LOGGER.debug("Modbus worker is stopping, dropping %s", func)
+
+    def set_slow_batches(self, indices: frozenset[int], interval: float) -> None:
+        """Hand the background-rate batches to the engine on the worker loop."""
+        self.run_on_worker(self.engine.set_slow_batches, indices, interval)
+
+    async def async_close(self) -> None:
+        """Close the Modbus client on the worker loop and stop the worker."""
+        if self.observers is not None:
+            self.observers.async_stop()
+        await self._journal_store.async_save(self.journal.as_dict())
+        if self.statistics is not None and self._statistics_loaded:
+            await self._statistics_store.async_save(self.statistics.as_dict())
+        if self._cycle is not None and not self._cycle.done():
+            self._cycle.cancel()
+        if self._mqtt_publisher is not None:
+            self._mqtt_publisher.stop()
+        try:
+            if self._socket_publisher is not None:
+                await self._worker.run(self._socket_publisher.stop())
+            if self._gateway is not None:
+                await self._worker.run(self._gateway.stop())
+            await self._worker.run(self.engine.close())
+        except RuntimeError:
+            pass
+        await self._worker.stop()
+
+    async def _async_update_data(self) -> RegisterView:
+        """Fetch data from the VSR unit.
+
+        The whole poll cycle runs on the Modbus worker; the finished snapshot
+        comes back to the HA loop in one thread-safe callback. Ticks arriving
+        while a cycle is still running share its result instead of queueing
+        another sweep behind the lock.
+        """
+        cycle = self._cycle
+        if cycle is None or cycle.done():
+            cycle = self._cycle = asyncio.ensure_future(self._async_run_cycle())
+        else:
+            # The counter belongs to the engine, so it is only touched on the worker loop
+            self.run_on_worker(self.engine.count_merged_tick)
+            _LOGGER.debug("Poll cycle still running, merging tick")
+        return await asyncio.shield(cycle)
+
+    async def _async_run_cycle(self) -> RegisterView:
+        """Run one poll cycle on the worker, then apply its side effects once on the HA loop."""
+        try:
+            data, payload, transitions = await self._worker.run(self._poll_and_publish())
+        except EngineError as err:
+            raise UpdateFailed(str(err)) from err
+        self._apply_backoff()
+        for key, old, new in transitions:
+            self._fire_alarm_event(key, old, new)
+        if payload is not None:
+            self._mqtt_publisher.publish(payload)
+        if self.statistics is not None and data.get("online"):
+            completed = self.statistics.add(data, time.time())
+            if completed:
+                async_import_hourly(self.hass, self.entry.entry_id, self.statistics, completed)
+        if self.journal and data.get("online"):
+            await self._async_replay_journal()
+        if self._controller is not None and data.get("online") and await self._async_run_controller(data):
+            # Show the new fan speed without waiting for the next sweep
+            data = await self._worker.run(self.engine.current_snapshot())
+        if data.get("online") and time.monotonic() >= self._alarm_log_due:
+            await self._async_sync_alarm_log()
+        return data
+
+    async def _async_replay_journal(self) -> None:
+        """Replay journaled writes, verifying each with a read.
+
+        Call only while the heartbeat is healthy. The journal is only touched
+        here on the HA loop; each write and read-back runs on the worker.
+        Entries that cannot be confirmed are retried on later cycles up to the
+        journal's attempt limit.
+        """
+        journal = self.journal
+        for entry in journal.expire(time.time()):
+            _LOGGER.warning("Dropping queued write of %s to register %s: older than %ss", entry.value, entry.address, journal.expiry)
+        for entry in journal.pending():
+            try:
+                confirmed = await self._worker.run(self.engine.write_register(entry.address, entry.value))
+                if confirmed:
+                    registers = await self._worker.run(
+                        self.engine.read_registers("holding", entry.address, 1, 0.0, PRIORITY_USER)
+                    )
+                    confirmed = registers[0] == entry.value
+            except WriteRejected as err:
+                _LOGGER.error("Dropping queued write of %s to register %s: %s", entry.value, entry.address, err)
+                journal.resolve(entry)
+                continue
+            except EngineError:
+                confirmed = False
+            if confirmed:
+                _LOGGER.info("Replayed queued write of %s to register %s", entry.value, entry.address)
+                journal.resolve(entry)
+                continue
+            entry.attempts += 1
+            if entry.attempts >= journal.max_attempts:
+                _LOGGER.warning(
+                    "Giving up on queued write of %s to register %s after %s attempts", entry.value, entry.address, entry.attempts
+                )
+                journal.resolve(entry)
+        self._save_journal()
+
+    async def _async_sync_alarm_log(self) -> None:
+        """Report alarm log entries added since the persisted cursor.
+
+        An unchanged log costs a single one-entry read; new entries are
+        fetched in coalesced reads and fired oldest first. On the first
+        successful sync the whole log is reported once, flagged as backfill.
+        """
+        self._alarm_log_due = time.monotonic() + ALARM_LOG_INTERVAL_SECONDS
+        backfill = not self._alarm_log_synced
+        try:
+            entries, cursor = await self._worker.run(self.engine.read_alarm_log(self._alarm_log_cursor))
+        except EngineError as err:
+            _LOGGER.warning("Alarm log sync failed, retrying in %ss: %s", ALARM_LOG_INTERVAL_SECONDS, err)
+            return
+        for entry in reversed(entries):
+            self._fire_alarm_log_event(decode_alarm_log_entry(entry), backfill)
+        if cursor != self._alarm_log_cursor or backfill:
+            self._alarm_log_cursor = cursor
+            self._alarm_log_synced = True
+            self._alarm_log_store.async_delay_save(lambda: {"cursor": self._alarm_log_cursor, "synced": True}, 1)
+        if entries:
+            _LOGGER.debug("%s new alarm log entr%s", len(entries), "y" if len(entries) == 1 else "ies")
+
+    def _fire_alarm_log_event(self, entry: dict, backfill: bool) -> None:
+        """Fire one event for an alarm log entry, stamped with the unit's local time."""
+        try:
+            occurred_at = datetime(*entry["timestamp"], tzinfo=dt_util.get_default_time_zone()).isoformat()
+        except ValueError:
+            occurred_at = None
+        self.hass.bus.async_fire(
+            EVENT_ALARM_LOG,
+            {
+                "config_entry_id": self.entry.entry_id,
+                "device_id": self._device_id,
+                "unit": self.entry.title,
+                "alarm_code": entry["alarm_code"],
+                "state": entry["state"],
+                "occurred_at": occurred_at,
+                "backfill": backfill,
+            },
+        )
+
+    async def _async_run_controller(self, data: RegisterView) -> bool:
+        """Let the demand controller adjust the manual fan speed from this cycle's snapshot.
+
+        Returns True when a new speed was written; the write lands in the
+        register image, so a fresh snapshot shows it without another sweep.
+        The write is never journaled: a speed chosen for this cycle's readings
+        is stale by the time the unit is back, so after a failure the next
+        evaluation decides again.
+        """
+        readings = {"temp_extract": data.get("temp_extract")}
+        if self._humidity_entity:
+            state = self.hass.states.get(self._humidity_entity)
+            try:
+                readings["humidity"] = float(state.state) if state is not None else None
+            except ValueError:
+                readings["humidity"] = None
+        value = self._controller.evaluate(readings, data.get("mode_speed"), data.get("mode_main"))
+        if value is None:
+            return False
+        try:
+            written = await self._worker.run(self.engine.write_register(1130, value))
+        except WriteRejected as err:
+            _LOGGER.error("Demand controller write of fan speed %s rejected: %s", value, err)
+            written = False
+        except EngineError as err:
+            _LOGGER.warning("Demand controller write of fan speed %s failed: %s", value, err)
+            written = False
+        if not written:
+            self._controller.reset()
+        return written
+
+    async def _poll_and_publish(self) -> tuple[RegisterView, tuple[bytes, bytes] | None, list[tuple[str, int, int]]]:
+        """Poll on the worker loop and encode the cycle's delta there, off the HA loop.
+
+        Socket clients are served directly from the worker; an MQTT payload and
+        the cycle's alarm transitions are returned so they can be handed to
+        Home Assistant on its loop.
+        """
+        data = await self.engine.poll()
+        payload = None
+        if self._socket_publisher is not None:
+            self._socket_publisher.publish(data)
+        elif self._mqtt_publisher is not None:
+            payload = self._mqtt_publisher.prepare(data)
+        return data, payload, self.engine.take_alarm_transitions()
+
+    def _fire_alarm_event(self, key: str, old: int, new: int) -> None:
+        """Fire one event for an alarm transition."""
+        _LOGGER.info(
+            "Alarm %s changed from %s to %s",
+            key, ALARM_STATE_MAP.get(old, old), ALARM_STATE_MAP.get(new, new),
+        )
+        self.hass.bus.async_fire(
+            EVENT_ALARM,
+            {
+                "config_entry_id": self.entry.entry_id,
+                "device_id": self._device_id,
+                "unit": self.entry.title,
+                "alarm_id": key,
+                "register": KEY_MAP[key][1],
+                "old_state": ALARM_STATE_MAP.get(old, str(old)),
+                "new_state": ALARM_STATE_MAP.get(new, str(new)),
+            },
+        )
+
+    def _apply_backoff(self) -> None:
+        """Back off exponentially while the heartbeat fails, restore the interval once it returns."""
+        delay = self.engine.poll_delay(UPDATE_INTERVAL_SECONDS, BACKOFF_MAX_SECONDS)
+        if self.coordinator.update_interval != timedelta(seconds=delay):
+            _LOGGER.debug("Setting poll interval to %ss", delay)
+            self.coordinator.update_interval = timedelta(seconds=delay)
+
+    async def async_refresh_keys(self, keys: list[str]) -> None:
+        """Read just the registers behind keys and push them to all entities.
+
+        Listeners get a fresh snapshot of the register image without running
+        a sweep or moving the next scheduled refresh.
+        """
+        try:
+            requests = await self._worker.run(self.engine.read_keys(keys))
+        except EngineError as err:
+            _LOGGER.warning("On-demand refresh of %s failed: %s", ", ".join(keys), err)
+            return
+        finally:
+            if self.observers is not None:
+                self.observers.hold(keys)
+        _LOGGER.debug("Refreshed %s with %s read(s)", ", ".join(keys), requests)
+        await self._async_push_snapshot()
+
+    async def _async_push_snapshot(self) -> None:
+        """Hand entities a snapshot of the image as it stands after an out-of-cycle read or write."""
+        self.coordinator.data = await self._worker.run(self.engine.current_snapshot())
+        self.coordinator.async_update_listeners()
+
+    async def async_write_register(self, address: int, value: int, slave: int = SLAVE_ID) -> bool:
+        """Write a single register, journaling it for replay if the unit cannot take it now.
+
+        While the heartbeat is failing the write goes straight to the journal
+        instead of adding retries to a recovering bus. A write the unit
+        rejects is never journaled: it would be rejected again.
+        """
+        data = self.coordinator.data
+        if data is not None and data.get("online"):
+            try:
+                written = await self._worker.run(self.engine.write_register(address, value, slave))
+            except WriteRejected as err:
+                _LOGGER.error("Write of %s to register %s not queued for replay: %s", value, address, err)
+                if self.journal:
+                    # The rejected value is the newest intent, so nothing older should be replayed either
+                    self.journal.supersede(address)
+                    self._save_journal()
+                return False
+            if written:
+                if self.journal:
+                    # This newer write wins over anything still queued for the register
+                    self.journal.supersede(address)
+                    self._save_journal()
+                return True
+        _LOGGER.warning("Write of %s to register %s failed, queued for replay when the unit is back", value, address)
+        self.journal.record(address, value, time.time())
+        self._save_journal()
+        return False
+
+    async def async_read_config_snapshot(self) -> dict:
+        """Return the unit's configuration registers as a snapshot, with decoded values for reference."""
+        registers = await self._worker.run(self.engine.read_config())
+        await self._async_push_snapshot()
+        data = self.coordinator.data
+        return {
+            "version": CONFIG_SNAPSHOT_VERSION,
+            "unit": self.entry.title,
+            "created_at": dt_util.now().isoformat(),
+            "registers": {str(address): value for address, value in registers.items()},
+            "values": {key: data.get(key) for key in CONFIG_KEYS} if data is not None else {},
+        }
+
+    async def async_apply_config_snapshot(self, snapshot: dict) -> dict:
+        """Apply a snapshot's registers, writing only those that differ; return write and verify counts."""
+        if snapshot.get("version") != CONFIG_SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+        registers = {int(address): int(value) for address, value in snapshot["registers"].items()}
+        result = await self._worker.run(self.engine.apply_config(registers))
+        await self._async_push_snapshot()
+        return result
+
+    async def async_get_week_schedule(self, refresh: bool = False) -> dict:
+        """Return the unit's week schedule, served from the register image when fresh."""
+        return await self._worker.run(self.engine.get_week_schedule(refresh))
+
+    async def async_set_week_schedule(self, schedule: dict) -> int:
+        """Apply schedule edits, writing only the changed register ranges; return registers written."""
+        return await self._worker.run(self.engine.set_week_schedule(schedule))
@@ -0,0 +1,66 @@
+"""Write journal for Systemair SAVE VSR.
+
+Writes that fail (or are issued while the unit is offline) are kept per
+holding register, newest value wins, and replayed once the heartbeat is
+healthy again. The journal serializes to plain data so the hub can persist
+it across restarts; timestamps are wall-clock for that reason.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class JournalEntry:
+    """Latest intended value for one holding register."""
+
+    address: int
+    value: int
+    queued_at: float  # wall time of the latest intent
+    attempts: int = 0
+
+
+class WriteJournal:
+    """Per-register, last-writer-wins journal of writes the unit has not confirmed."""
+
+    def __init__(self, expiry: float, max_attempts: int) -> None:
+        self.expiry = expiry
+        self.max_attempts = max_attempts
+        self._entries: dict[int, JournalEntry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, address: int, value: int, now: float) -> None:
+        """Queue a write, replacing any older intent for the same register."""
+        self._entries[address] = JournalEntry(address, value, now)
+
+    def supersede(self, address: int) -> None:
+        """Drop the intent for a register after a newer write reached the unit."""
+        self._entries.pop(address, None)
+
+    def resolve(self, entry: JournalEntry) -> None:
+        """Drop an entry once replayed, unless a newer intent replaced it meanwhile."""
+        if self._entries.get(entry.address) is entry:
+            del self._entries[entry.address]
+
+    def pending(self) -> list[JournalEntry]:
+        """Return queued writes, oldest intent first."""
+        return sorted(self._entries.values(), key=lambda entry: entry.queued_at)
+
+    def expire(self, now: float) -> list[JournalEntry]:
+        """Drop and return intents older than the expiry; the user has likely moved on."""
+        expired = [entry for entry in self._entries.values() if now - entry.queued_at > self.expiry]
+        for entry in expired:
+            self.resolve(entry)
+        return expired
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"entries": [asdict(entry) for entry in self._entries.values()]}
+
+    def load(self, data: dict[str, Any] | None) -> None:
+        """Restore entries saved by as_dict()."""
+        for item in (data or {}).get("entries", []):
+            entry = JournalEntry(**item)
+            self._entries[entry.address] = entry
@@ -0,0 +1,36 @@
+"""Describe Systemair SAVE VSR logbook events."""
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.components.logbook import LOGBOOK_ENTRY_MESSAGE, LOGBOOK_ENTRY_NAME
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, EVENT_ALARM, EVENT_ALARM_LOG
+
+
+@callback
+def async_describe_events(
+    hass: HomeAssistant,
+    async_describe_event: Callable[[str, str, Callable[[Event], dict[str, str]]], None],
+) -> None:
+    """Describe alarm transitions and alarm log entries for the logbook."""
+
+    @callback
+    def async_describe_alarm(event: Event) -> dict[str, str]:
+        data = event.data
+        return {
+            LOGBOOK_ENTRY_NAME: data["unit"],
+            LOGBOOK_ENTRY_MESSAGE: f"alarm {data['alarm_id']} changed from {data['old_state']} to {data['new_state']}",
+        }
+
+    @callback
+    def async_describe_alarm_log(event: Event) -> dict[str, str]:
+        data = event.data
+        message = f"logged alarm {data['alarm_code']} as {data['state']}"
+        if data.get("occurred_at"):
+            message += f" at {data['occurred_at']}"
+        return {LOGBOOK_ENTRY_NAME: data["unit"], LOGBOOK_ENTRY_MESSAGE: message}
+
+    async_describe_event(DOMAIN, EVENT_ALARM, async_describe_alarm)
+    async_describe_event(DOMAIN, EVENT_ALARM_LOG, async_describe_alarm_log)
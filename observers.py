@@ -0,0 +1,132 @@
+"""Observer-aware poll rates for Systemair SAVE VSR.
+
+Finds out which entities anything consumes (automations, scripts, the
+recorder, service calls and on-demand refreshes, plus the hub's own
+controller and statistics) and slows the register batches nobody uses down
+to a background rate. Consumers coming back restore the full rate on the
+next cycle.
+
+Frontend websocket subscriptions are not exposed to integrations, so an
+open dashboard only counts once it calls a service or refreshes an entity.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_CALL_SERVICE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
+
+from .const import OBSERVER_HOLD_SECONDS, OBSERVER_SCAN_SECONDS, UNOBSERVED_POLL_SECONDS
+from .registers import ALARM_KEYS, HEARTBEAT_BATCH, KEY_MAP, REGISTER_BATCHES
+
+if TYPE_CHECKING:
+    from .hub import SAVEVSRHub
+
+_LOGGER = logging.getLogger(__name__)
+
+# Batches that keep their own rate regardless of consumers: the heartbeat, alarms
+# (they drive events) and batches that already have a slower interval
+_PINNED_BATCHES: frozenset[int] = frozenset(
+    index
+    for index, batch in enumerate(REGISTER_BATCHES)
+    if batch is HEARTBEAT_BATCH or batch.get("interval") or any(key in ALARM_KEYS for key in batch["keys"] if key)
+)
+
+
+class ObserverTracker:
+    """Track consumers of the hub's entities and slow down unobserved register batches."""
+
+    def __init__(self, hass: HomeAssistant, hub: SAVEVSRHub) -> None:
+        self.hass = hass
+        self.hub = hub
+        self._entities: dict[str, tuple[str, ...]] = {}  # entity_id -> register-backed keys
+        self._held: dict[str, float] = {}  # key -> monotonic time its hold expires
+        self._unsubs: list = []
+
+    def register(self, entity_id: str, keys: Iterable[str]) -> None:
+        self._entities[entity_id] = tuple(key for key in keys if key in KEY_MAP)
+
+    def unregister(self, entity_id: str) -> None:
+        self._entities.pop(entity_id, None)
+
+    @callback
+    def async_start(self) -> None:
+        """Scan once Home Assistant has started, then periodically and whenever consumers reload."""
+        self._unsubs.append(async_at_started(self.hass, self.async_scan))
+        self._unsubs.append(
+            async_track_time_interval(self.hass, self.async_scan, timedelta(seconds=OBSERVER_SCAN_SECONDS))
+        )
+        for event in ("automation_reloaded", "script_reloaded"):
+            self._unsubs.append(self.hass.bus.async_listen(event, self.async_scan))
+        self._unsubs.append(self.hass.bus.async_listen(EVENT_CALL_SERVICE, self._async_service_called))
+
+    @callback
+    def async_stop(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def hold(self, keys: Iterable[str]) -> None:
+        """Count keys as observed for a while, e.g. after an on-demand refresh."""
+        until = time.monotonic() + OBSERVER_HOLD_SECONDS
+        changed = False
+        for key in keys:
+            changed |= key not in self._held or self._held[key] < time.monotonic()
+            self._held[key] = until
+        if changed:
+            self.async_scan()
+
+    @callback
+    def _async_service_called(self, event: Event) -> None:
+        entity_ids = event.data.get("service_data", {}).get(ATTR_ENTITY_ID)
+        if not entity_ids:
+            return
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        keys = [key for entity_id in entity_ids for key in self._entities.get(entity_id, ())]
+        if keys:
+            self.hold(keys)
+
+    def _is_observed(self, entity_id: str) -> bool:
+        from homeassistant.components.automation import automations_with_entity
+        from homeassistant.components.script import scripts_with_entity
+
+        if "automation" in self.hass.config.components and automations_with_entity(self.hass, entity_id):
+            return True
+        if "script" in self.hass.config.components and scripts_with_entity(self.hass, entity_id):
+            return True
+        if "recorder" in self.hass.config.components:
+            from homeassistant.components.recorder import get_instance
+
+            entity_filter = getattr(get_instance(self.hass), "entity_filter", None)
+            if entity_filter is None or entity_filter(entity_id):
+                return True
+        return False
+
+    def observed_keys(self) -> set[str]:
+        """Return the register-backed keys something consumes right now."""
+        now = time.monotonic()
+        observed = {key for key, until in self._held.items() if until > now}
+        observed.update(self.hub.internal_keys())
+        for entity_id, keys in self._entities.items():
+            if keys and not observed.issuperset(keys) and self._is_observed(entity_id):
+                observed.update(keys)
+        return observed
+
+    @callback
+    def async_scan(self, *_: object) -> None:
+        """Recompute which batches may drop to the background rate."""
+        observed = self.observed_keys()
+        slow = frozenset(
+            index
+            for index, batch in enumerate(REGISTER_BATCHES)
+            if index not in _PINNED_BATCHES and not any(key in observed for key in batch["keys"] if key)
+        )
+        _LOGGER.debug("%s of %s register batches unobserved", len(slow), len(REGISTER_BATCHES))
+        self.hub.set_slow_batches(slow, UNOBSERVED_POLL_SECONDS)
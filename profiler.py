@@ -0,0 +1,134 @@
+"""Profiling CLI for the SAVE VSR poll engine.
+
+Runs the same engine the integration wraps (transport, batch planner,
+image and decode) on a plain asyncio loop, against the simulated unit or a
+real one on a serial port, and prints the timing of every cycle: wall time,
+CPU time spent in Python, transactions and deferred blocks. With --cprofile
+the run is recorded with cProfile and the hottest functions are printed;
+for sampling, run it under py-spy instead:
+
+    python -m custom_components.systemair_save_vsr.profiler --cycles 100 --cprofile poll.prof
+    py-spy record -o poll.svg -- python -m custom_components.systemair_save_vsr.profiler --port /dev/ttyUSB0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import json
+import logging
+import pstats
+import statistics
+import sys
+import time
+from typing import Any
+
+from .const import (
+    BACKOFF_MAX_SECONDS,
+    DEFAULT_STALE_AFTER_SECONDS,
+    TRANSPORT_NATIVE,
+    TRANSPORT_PYMODBUS,
+    UPDATE_INTERVAL_SECONDS,
+)
+from .engine import EngineError, SAVEVSREngine, create_client
+from .simulator import FaultProfile, SimulatedClient, SimulatedUnit
+
+
+async def profile_cycles(engine: SAVEVSREngine, cycles: int, interval: float) -> list[dict[str, Any]]:
+    """Poll cycles times, pacing cycles like the coordinator, and return one timing record per cycle."""
+    records = []
+    try:
+        for number in range(1, cycles + 1):
+            started = time.monotonic()
+            cpu_started = time.process_time()
+            transactions = getattr(engine.client, "transactions", 0)
+            try:
+                view = await engine.poll()
+                online = bool(view.get("online"))
+            except EngineError as err:
+                logging.getLogger(__name__).warning("Cycle %s failed: %s", number, err)
+                online = False
+            record = {
+                "cycle": number,
+                "wall_ms": round((time.monotonic() - started) * 1000, 2),
+                "cpu_ms": round((time.process_time() - cpu_started) * 1000, 2),
+                "online": online,
+                **engine.cycle_stats,
+            }
+            if hasattr(engine.client, "transactions"):
+                # Only the simulator counts transactions
+                record["transactions"] = engine.client.transactions - transactions
+            records.append(record)
+            print(json.dumps(record), flush=True)
+            delay = engine.poll_delay(interval, BACKOFF_MAX_SECONDS)
+            if number < cycles:
+                await asyncio.sleep(max(0.0, delay - (time.monotonic() - started)))
+    finally:
+        await engine.close()
+    return records
+
+
+def summarize(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return median, 95th percentile and maximum wall and CPU time over the cycles."""
+    summary: dict[str, Any] = {"cycles": len(records), "offline": sum(not record["online"] for record in records)}
+    for field in ("wall_ms", "cpu_ms"):
+        values = sorted(record[field] for record in records)
+        if not values:
+            continue
+        summary[field] = {
+            "median": round(statistics.median(values), 2),
+            "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max": values[-1],
+        }
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Poll a SAVE VSR unit or the simulator and time every cycle.")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=UPDATE_INTERVAL_SECONDS, help="seconds between cycles")
+    parser.add_argument("--port", help="serial port of a real unit; the simulator is used when omitted")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--bytesize", type=int, default=8)
+    parser.add_argument("--parity", default="N")
+    parser.add_argument("--stopbits", type=int, default=1)
+    parser.add_argument("--transport", choices=[TRANSPORT_PYMODBUS, TRANSPORT_NATIVE], default=TRANSPORT_PYMODBUS)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per transaction")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cprofile", metavar="FILE", help="record the run with cProfile and write stats to FILE")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key for the printed profile")
+    parser.add_argument("--top", type=int, default=25, help="functions to print from the profile")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+    if args.port:
+        config = {
+            "port": args.port,
+            "baudrate": args.baudrate,
+            "bytesize": args.bytesize,
+            "parity": args.parity,
+            "stopbits": args.stopbits,
+        }
+        engine = SAVEVSREngine(lambda: create_client(config, args.transport), DEFAULT_STALE_AFTER_SECONDS)
+    else:
+        client = SimulatedClient(SimulatedUnit(seed=args.seed), FaultProfile(latency=args.latency, seed=args.seed))
+        engine = SAVEVSREngine(lambda: client, DEFAULT_STALE_AFTER_SECONDS)
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        records = asyncio.run(profile_cycles(engine, args.cycles, args.interval))
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats(args.sort).print_stats(args.top)
+
+    print(json.dumps({"summary": summarize(records)}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
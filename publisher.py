@@ -0,0 +1,269 @@
+"""Publish decoded snapshot deltas to external consumers.
+
+Each poll cycle produces at most one message holding the keys whose value
+changed since the previous cycle. Messages go either to MQTT (through Home
+Assistant's MQTT integration) or to clients of a local Unix domain socket.
+Slow consumers never hold up the hub: once their queue is full, newer
+changes are merged into the last unsent message, so no changed key is lost.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import errno
+import os
+import stat
+import time
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from .const import (
+    PUBLISH_FORMAT_JSON,
+    PUBLISH_FORMAT_MSGPACK,
+    PUBLISH_QUEUE_SIZE,
+    PUBLISH_STATE_SUBTOPIC,
+    SERVER_CLOSE_TIMEOUT_SECONDS,
+)
+from .registers import KEY_MAP
+
+_LOGGER = logging.getLogger(__name__)
+
+# Register-backed keys plus the snapshot extras consumers care about; cycle
+# statistics change every cycle and would defeat delta publishing.
+PUBLISH_KEYS: tuple[str, ...] = (*KEY_MAP, "online", "active_alarms")
+
+
+class DeltaEncoder:
+    """Turn successive snapshots into compact delta messages."""
+
+    def __init__(self, unit: str, fmt: str) -> None:
+        if fmt == PUBLISH_FORMAT_MSGPACK and msgpack is None:
+            _LOGGER.warning("msgpack is not installed, publishing JSON instead")
+            fmt = PUBLISH_FORMAT_JSON
+        self.unit = unit
+        self.format = fmt
+        self._last: dict[str, Any] = {}
+        self._seq = 0
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, float):
+            return round(value, 3)
+        return value
+
+    def _encode(self, message: dict[str, Any]) -> bytes:
+        if self.format == PUBLISH_FORMAT_MSGPACK:
+            return msgpack.packb(message, use_bin_type=True)
+        return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+    def _decode(self, payload: bytes) -> dict[str, Any]:
+        if self.format == PUBLISH_FORMAT_MSGPACK:
+            return msgpack.unpackb(payload, raw=False)
+        return json.loads(payload)
+
+    def _message(self, values: dict[str, Any], full: bool) -> bytes:
+        return self._encode(
+            {"unit": self.unit, "seq": self._seq, "ts": round(time.time(), 3), "full": full, "values": values}
+        )
+
+
+    def delta(self, snapshot: Mapping[str, Any]) -> bytes | None:
+        """Return an encoded message with changed keys, or None when nothing changed."""
+        # Stale keys read as None, so a key going unavailable is published too
+        current = {key: self._normalize(snapshot.get(key)) for key in PUBLISH_KEYS}
+        full = not self._last
+        changed = current if full else {key: value for key, value in current.items() if self._last[key] != value}
+        self._last = current
+        if not changed:
+            return None
+        self._seq += 1
+        return self._message(changed, full)
+
+    def full(self) -> bytes:
+        """Return the complete last snapshot for a new subscriber, tagged with the current sequence number."""
+        return self._message(dict(self._last), True)
+
+    def merge(self, older: bytes, newer: bytes) -> bytes:
+        """Fold an unsent message into the next one, so a consumer that never got it loses no keys."""
+        first, message = self._decode(older), self._decode(newer)
+        message["full"] = first["full"] or message["full"]
+        message["values"] = {**first["values"], **message["values"]}
+        return self._encode(message)
+
+
+class _SocketClient:
+    """One connected Unix socket consumer with a bounded queue that merges once full."""
+
+    def __init__(self, writer: asyncio.StreamWriter, encoder: DeltaEncoder) -> None:
+        self.writer = writer
+        self.encoder = encoder
+        self.queue: deque[bytes] = deque()
+        self.ready = asyncio.Event()
+        self.merged = 0
+
+    def push(self, payload: bytes) -> None:
+        if len(self.queue) >= PUBLISH_QUEUE_SIZE:
+            self.merged += 1
+            self.queue[-1] = self.encoder.merge(self.queue[-1], payload)
+        else:
+            self.queue.append(payload)
+        self.ready.set()
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.queue:
+                    self.writer.write(self.queue.popleft())
+                    await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.writer.close()
+
+
+class UnixSocketPublisher:
+    """Serve snapshot deltas to any number of local Unix socket clients."""
+
+    def __init__(self, path: str, encoder: DeltaEncoder) -> None:
+        self._path = path
+        self._encoder = encoder
+        self._server: asyncio.base_events.Server | None = None
+        self._clients: dict[_SocketClient, asyncio.Task] = {}
+        self._inode: tuple[int, int] | None = None  # (device, inode) of the socket this publisher created
+
+    def _socket_inode(self) -> tuple[int, int] | None:
+        """Return (device, inode) of the socket at the path, None if nothing is there.
+
+        Raises FileExistsError when the path holds anything but a socket, so a
+        mistyped option can never replace a regular file.
+        """
+        try:
+            st = os.lstat(self._path)
+        except FileNotFoundError:
+            return None
+        if not stat.S_ISSOCK(st.st_mode):
+            raise FileExistsError(errno.EEXIST, "Path exists and is not a socket", self._path)
+        return st.st_dev, st.st_ino
+
+    @property
+    def merged(self) -> int:
+        return sum(client.merged for client in self._clients)
+
+    async def start(self) -> None:
+        """Start listening; run on the loop that will call publish().
+
+        A stale socket left by an earlier run is replaced; any other file at
+        the path raises FileExistsError.
+        """
+        if self._socket_inode() is not None:
+            os.unlink(self._path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self._path)
+        self._inode = self._socket_inode()
+        _LOGGER.debug("Publishing snapshots on unix socket %s", self._path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _SocketClient(writer, self._encoder)
+        client.push(self._encoder.full())
+        task = asyncio.current_task()
+        self._clients[client] = task
+        try:
+            await client.run()
+        finally:
+            self._clients.pop(client, None)
+
+    def publish(self, snapshot: Mapping[str, Any]) -> None:
+        """Queue the delta for every connected client."""
+        payload = self._encoder.delta(snapshot)
+        if payload is None:
+            return
+        for client in self._clients:
+            client.push(payload)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Since Python 3.12.1 wait_closed() also waits for open connections, so drop them first
+            tasks = list(self._clients.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._clients.clear()
+            try:
+                await asyncio.wait_for(self._server.wait_closed(), SERVER_CLOSE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Snapshot socket %s did not close within %ss", self._path, SERVER_CLOSE_TIMEOUT_SECONDS)
+            self._server = None
+        # Remove only the socket this publisher created, never whatever took its place since
+        try:
+            if self._inode is not None and self._socket_inode() == self._inode:
+                os.unlink(self._path)
+        except OSError as err:
+            _LOGGER.warning("Cannot remove snapshot socket %s: %s", self._path, err)
+        self._inode = None
+
+
+class MqttPublisher:
+    """Publish snapshot deltas to MQTT through Home Assistant's MQTT integration.
+
+    Deltas go to the topic unretained. Whenever keys change, the complete
+    snapshot is also published retained to <topic>/state, so a new
+    subscriber starts from the current state and follows the deltas from
+    there. Only one publish is in flight at a time; while it is pending,
+    newer deltas are merged into the queued one and the newer state
+    replaces the queued one, so a slow broker never builds a backlog and
+    never misses a changed key.
+    """
+
+    def __init__(self, hass: Any, topic: str, encoder: DeltaEncoder) -> None:
+        self._hass = hass
+        self._topic = topic
+        self._state_topic = f"{topic}/{PUBLISH_STATE_SUBTOPIC}"
+        self._encoder = encoder
+        self._pending: tuple[bytes, bytes] | None = None
+        self._task: asyncio.Task | None = None
+        self.merged = 0
+
+    def prepare(self, snapshot: Mapping[str, Any]) -> tuple[bytes, bytes] | None:
+        """Encode the delta and the full state for a snapshot (safe to call off the HA loop)."""
+        payload = self._encoder.delta(snapshot)
+        return None if payload is None else (payload, self._encoder.full())
+
+    def _merge(self, older: tuple[bytes, bytes], newer: tuple[bytes, bytes]) -> tuple[bytes, bytes]:
+        self.merged += 1
+        return self._encoder.merge(older[0], newer[0]), newer[1]
+
+    def publish(self, payload: tuple[bytes, bytes]) -> None:
+        """Publish a prepared delta and state; must be called on the HA loop."""
+        if self._pending is not None:
+            payload = self._merge(self._pending, payload)
+        self._pending = payload
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_background_task(self._async_drain(), "save_vsr_mqtt_publish")
+
+    async def _async_drain(self) -> None:
+        from homeassistant.components import mqtt
+
+        while self._pending is not None:
+            pending, self._pending = self._pending, None
+            delta, state = pending
+            try:
+                await mqtt.async_publish(self._hass, self._topic, delta, qos=0, retain=False)
+                await mqtt.async_publish(self._hass, self._state_topic, state, qos=0, retain=True)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning("Failed to publish snapshot to MQTT topic %s: %s", self._topic, err)
+                # Keep the changes for the next cycle's message instead of losing them
+                self._pending = pending if self._pending is None else self._merge(pending, self._pending)
+                return
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
@@ -0,0 +1,503 @@
+"""Register map and local register image for Systemair SAVE VSR."""
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from .const import COUNTDOWN_RESYNC_SECONDS
+
+# Batch read registers where possible to reduce communication overhead
+REGISTER_BATCHES: list[dict] = [
+    # Climate (input registers)
+    {"type": "input", "start": 1160, "count": 1, "keys": ["mode_main"], "scales": [1]},
+    {"type": "input", "start": 12102, "count": 1, "keys": ["temp_supply"], "scales": [0.1]},
+    # Climate (holding registers)
+    {"type": "holding", "start": 1130, "count": 1, "keys": ["mode_speed"], "scales": [1]},
+    {"type": "holding", "start": 2000, "count": 1, "keys": ["target_temp"], "scales": [0.1]},
+    # Binary sensors and switches
+    {"type": "holding", "start": 1038, "count": 1, "keys": ["mode_summerwinter"], "scales": [1], "bool": True},
+    {"type": "holding", "start": 1350, "count": 2, "keys": ["fan_running", "cooldown"], "scales": [1, 1], "bool": True},
+    {"type": "holding", "start": 14003, "count": 1, "keys": ["damper_state"], "scales": [1], "bool": True},
+
+    {"type": "holding", "start": 2133, "count": 1, "keys": ["cooling_recovery"], "scales": [1], "bool": True},
+    {"type": "holding", "start": 2504, "count": 1, "keys": ["eco_modus"], "scales": [1], "bool": True},
+    {"type": "holding", "start": 3001, "count": 1, "keys": ["heater_switch"], "scales": [1], "bool": True},
+    # Alarms (batched where possible; read as numeric for ENUM mapping)
+    {"type": "holding", "start": 15001, "count": 1, "keys": ["alarm_saf"], "scales": [1]},
+    {"type": "holding", "start": 15008, "count": 1, "keys": ["alarm_eaf"], "scales": [1]},
+    {"type": "holding", "start": 15015, "count": 8, "keys": ["alarm_frost_protect", None, None, None, None, None, None, "alarm_defrosting"], "scales": [1]*8},
+    {"type": "holding", "start": 15029, "count": 1, "keys": ["alarm_saf_rpm"], "scales": [1]},
+    {"type": "holding", "start": 15036, "count": 1, "keys": ["alarm_eaf_rpm"], "scales": [1]},
+    {"type": "holding", "start": 15057, "count": 1, "keys": ["alarm_fpt"], "scales": [1]},
+    {"type": "holding", "start": 15064, "count": 1, "keys": ["alarm_oat"], "scales": [1]},
+    {"type": "holding", "start": 15071, "count": 1, "keys": ["alarm_sat"], "scales": [1]},
+    {"type": "holding", "start": 15078, "count": 1, "keys": ["alarm_rat"], "scales": [1]},
+    {"type": "holding", "start": 15085, "count": 1, "keys": ["alarm_eat"], "scales": [1]},
+    {"type": "holding", "start": 15092, "count": 1, "keys": ["alarm_ect"], "scales": [1]},
+    {"type": "holding", "start": 15099, "count": 1, "keys": ["alarm_eft"], "scales": [1]},
+    {"type": "holding", "start": 15106, "count": 1, "keys": ["alarm_oht"], "scales": [1]},
+    {"type": "holding", "start": 15113, "count": 1, "keys": ["alarm_emt"], "scales": [1]},
+    {"type": "holding", "start": 15127, "count": 1, "keys": ["alarm_bys"], "scales": [1]},
+    {"type": "holding", "start": 15134, "count": 1, "keys": ["alarm_sec_air"], "scales": [1]},
+    {"type": "holding", "start": 15141, "count": 1, "keys": ["alarm_filter"], "scales": [1]},
+    {"type": "holding", "start": 15162, "count": 1, "keys": ["alarm_rh"], "scales": [1]},
+    {"type": "holding", "start": 15176, "count": 1, "keys": ["alarm_low_SAT"], "scales": [1]},
+    {"type": "holding", "start": 15508, "count": 1, "keys": ["alarm_pdm_rhs"], "scales": [1]},
+    {"type": "holding", "start": 15515, "count": 1, "keys": ["alarm_pdm_eat"], "scales": [1]},
+    {"type": "holding", "start": 15522, "count": 1, "keys": ["alarm_man_fan_stop"], "scales": [1]},
+    {"type": "holding", "start": 15529, "count": 1, "keys": ["alarm_overheat_temp"], "scales": [1]},
+    {"type": "holding", "start": 15536, "count": 1, "keys": ["alarm_fire"], "scales": [1]},
+    {"type": "holding", "start": 15543, "count": 1, "keys": ["alarm_filter_warn"], "scales": [1]},
+    {"type": "holding", "start": 15900, "count": 3, "keys": ["alarm_typeA", "alarm_typeB", "alarm_typeC"], "scales": [1, 1, 1]},
+
+    # Sensors
+
+    # Countdowns: read rarely and extrapolated from the monotonic clock in between
+    {"type": "holding", "start": 1110, "count": 1, "keys": ["usermode_remain_time"], "scales": [1], "interval": COUNTDOWN_RESYNC_SECONDS, "countdown": True},
+
+    {"type": "holding", "start": 7005, "count": 1, "keys": ["filter_replace_seconds"], "scales": [1], "interval": COUNTDOWN_RESYNC_SECONDS, "countdown": True},
+
+    {"type": "holding", "start": 12101, "count": 2, "keys": ["temp_outdoor", "temp_supply"], "scales": [0.1, 0.1]},
+    {"type": "holding", "start": 12105, "count": 1, "keys": ["temp_exhaust"], "scales": [0.1]},
+    {"type": "holding", "start": 12542, "count": 1, "keys": ["temp_extract"], "scales": [0.1]},
+
+    {"type": "holding", "start": 12107, "count": 1, "keys": ["temp_overheat"], "scales": [0.1]},
+    {"type": "holding", "start": 12112, "count": 2, "keys": ["supply_air_pressure", "extract_air_pressure"], "scales": [1, 1]},
+
+
+    {"type": "holding", "start": 12201, "count": 1, "keys": ["sfp_supply"], "scales": [1]},
+    {"type": "holding", "start": 12203, "count": 1, "keys": ["heat_recovery_efficiency"], "scales": [1]},
+    {"type": "holding", "start": 12400, "count": 2, "keys": ["saf_rpm", "eaf_rpm"], "scales": [1, 1]},
+
+    {"type": "holding", "start": 14000, "count": 2, "keys": ["fan_supply", "fan_extract"], "scales": [1, 1]},
+    {"type": "holding", "start": 14001, "count": 2, "keys": ["supply_fan_speed", "extract_fan_speed"], "scales": [1, 1]},
+    {"type": "holding", "start": 14101, "count": 1, "keys": ["heater_percentage"], "scales": [1]},
+    {"type": "holding", "start": 14102, "count": 1, "keys": ["heat_exchanger_state"], "scales": [1]},
+    {"type": "holding", "start": 14350, "count": 1, "keys": ["rotor"], "scales": [1]},
+    {"type": "holding", "start": 2148, "count": 1, "keys": ["heater"], "scales": [1]},
+
+    {"type": "holding", "start": 2314, "count": 1, "keys": ["cooling_recovery_temp"], "scales": [1]},
+    {"type": "holding", "start": 2503, "count": 1, "keys": ["setpoint_eco_offset"], "scales": [0.1]},
+]
+
+# Cheap single-register read done first every cycle to detect an offline unit
+HEARTBEAT_BATCH: dict = REGISTER_BATCHES[0]
+
+REGISTER_KEYS: frozenset[str] = frozenset(
+    key for batch in REGISTER_BATCHES for key in batch["keys"] if key
+)
+
+
+# key -> (register type, address, scale, is_bool); later batches win for keys read twice
+KEY_MAP: dict[str, tuple[str, int, float, bool]] = {
+    key: (batch["type"], batch["start"] + i, scale, batch.get("bool", False))
+    for batch in REGISTER_BATCHES
+    for i, (key, scale) in enumerate(zip(batch["keys"], batch["scales"]))
+    if key
+}
+# Keys of batches polled on their own slower interval; staleness is measured on top of it
+KEY_INTERVALS: dict[str, float] = {
+    key: batch["interval"]
+    for batch in REGISTER_BATCHES
+    if batch.get("interval")
+    for key in batch["keys"]
+    if key
+}
+COUNTDOWN_KEYS: frozenset[str] = frozenset(
+    key for batch in REGISTER_BATCHES if batch.get("countdown") for key in batch["keys"] if key
+)
+COUNTDOWN_BATCHES: frozenset[int] = frozenset(
+    index for index, batch in enumerate(REGISTER_BATCHES) if batch.get("countdown")
+)
+# Writes to these registers change the user mode and restart its countdown. The fan speed
+# setpoint (1130) is not one of them: it only moves speed-dependent values, which any write
+# already polls fast, and a mode switch it causes shows up in the heartbeat
+MODE_COMMAND_REGISTERS: frozenset[int] = frozenset({1161})
+
+# Alarm registers (0 Inactive, 1 Active, 2 Waiting, 3 Cleared Error Active)
+ALARM_STATE_MAP: dict[int, str] = {
+    0: "Inactive",
+    1: "Active",
+    2: "Waiting",
+    3: "Cleared Error Active",
+}
+ALARM_KEYS: tuple[str, ...] = tuple(key for key in KEY_MAP if key.startswith("alarm_"))
+# Type A/B/C are summary flags over the individual alarms, not alarms of their own
+ALARM_SUMMARY_KEYS: frozenset[str] = frozenset({"alarm_typeA", "alarm_typeB", "alarm_typeC"})
+
+
+def decode(raw: int, scale: float, is_bool: bool) -> Any:
+    """Decode a raw register value the way the batch table describes it."""
+    return (raw > 0) if is_bool else (raw * scale)
+
+
+def map_value(raw: Any, value_map: dict[int, str] | None) -> Any:
+    """Map a decoded register (int or bool) to its label; unknown values pass through."""
+    if raw is None or not value_map:
+        return raw
+    try:
+        normalized = (1 if raw else 0) if isinstance(raw, bool) else int(raw)
+    except (ValueError, TypeError):
+        return raw
+    return value_map.get(normalized, raw)
+
+
+def stale_limit(key: str, stale_after: float, intervals: Mapping[str, float] = KEY_INTERVALS) -> float:
+    """Return how old a key's value may get before it is considered stale.
+
+    Keys polled on a slower interval than every cycle get that interval on top.
+    """
+    return stale_after + intervals.get(key, 0)
+
+
+def extrapolate_countdown(raw: int, scale: float, elapsed: float) -> float | int:
+    """Return a countdown value advanced by the time elapsed since it was read, floored at zero."""
+    return max(0, int(raw * scale - elapsed))
+
+
+class RegisterImage:
+    """Compact array-backed mirror of the raw registers read from or written to the unit.
+
+    Each register has a slot holding its raw value, the monotonic time it was
+    last read, the image generation it last changed in and a pending-write
+    marker that is cleared once the register is read back.
+    """
+
+    __slots__ = ("_slots", "_values", "_read_at", "_changed_in", "_pending", "generation")
+
+    def __init__(self) -> None:
+        self._slots: dict[tuple[str, int], int] = {}
+        self._values = array("H")
+        self._read_at = array("d")  # 0.0 = never read
+        self._changed_in = array("L")
+        self._pending = array("B")
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _slot(self, reg_type: str, address: int) -> int:
+        slot = self._slots.get((reg_type, address))
+        if slot is None:
+            # Grow the arrays before publishing the slot, so a lookup never sees an index past their end
+            slot = len(self._values)
+            self._values.append(0)
+            self._read_at.append(0.0)
+            self._changed_in.append(0)
+            self._pending.append(0)
+            self._slots[(reg_type, address)] = slot
+        return slot
+
+    def copy(self) -> RegisterImage:
+        """Return an independent copy, e.g. to hand a finished cycle to another thread."""
+        image = RegisterImage()
+        image._slots = dict(self._slots)
+        image._values = array("H", self._values)
+        image._read_at = array("d", self._read_at)
+        image._changed_in = array("L", self._changed_in)
+        image._pending = array("B", self._pending)
+        image.generation = self.generation
+        return image
+
+    def store(self, reg_type: str, start: int, registers: list[int], now: float | None = None) -> int:
+        """Store a block read from the unit; return the number of registers that changed."""
+        now = time.monotonic() if now is None else now
+        self.generation += 1
+        changed = 0
+        for offset, raw in enumerate(registers):
+            slot = self._slot(reg_type, start + offset)
+            if self._values[slot] != raw or not self._read_at[slot]:
+                self._values[slot] = raw
+                self._changed_in[slot] = self.generation
+                changed += 1
+            self._read_at[slot] = now
+            self._pending[slot] = 0
+        return changed
+
+    def mark_written(self, address: int, value: int) -> None:
+        """Record a successful holding-register write, pending read-back."""
+        slot = self._slot("holding", address)
+        self.generation += 1
+        self._values[slot] = value
+        self._changed_in[slot] = self.generation
+        self._pending[slot] = 1
+
+    def get(self, reg_type: str, address: int) -> int | None:
+        """Return the raw register value, or None if it was never read or written."""
+        slot = self._slots.get((reg_type, address))
+        if slot is None or not (self._read_at[slot] or self._pending[slot]):
+            return None
+        return self._values[slot]
+
+    def read_at(self, reg_type: str, address: int) -> float | None:
+        """Return the monotonic time of the last read, or None if never read."""
+        slot = self._slots.get((reg_type, address))
+        if slot is None or not self._read_at[slot]:
+            return None
+        return self._read_at[slot]
+
+    def is_pending(self, reg_type: str, address: int) -> bool:
+        """Return True if a write to the register has not been read back yet."""
+        slot = self._slots.get((reg_type, address))
+        return slot is not None and bool(self._pending[slot])
+
+    def is_confirmed(self, reg_type: str, address: int, value: int) -> bool:
+        """Return True if the unit last reported exactly this value and no write is pending."""
+        slot = self._slots.get((reg_type, address))
+        return (
+            slot is not None
+            and bool(self._read_at[slot])
+            and not self._pending[slot]
+            and self._values[slot] == value
+        )
+
+    def block(self, reg_type: str, start: int, count: int) -> list[int | None]:
+        """Return raw values for a contiguous range; None where unknown."""
+        return [self.get(reg_type, address) for address in range(start, start + count)]
+
+    def oldest_read(self, reg_type: str, start: int, count: int) -> float | None:
+        """Return the oldest read time in a range, or None if any register was never read."""
+        oldest: float | None = None
+        for address in range(start, start + count):
+            read_at = self.read_at(reg_type, address)
+            if read_at is None:
+                return None
+            oldest = read_at if oldest is None else min(oldest, read_at)
+        return oldest
+
+    def changed_since(self, generation: int) -> list[tuple[str, int]]:
+        """Return the registers whose value changed after the given generation."""
+        changed_in = self._changed_in
+        return [ref for ref, slot in self._slots.items() if changed_in[slot] > generation]
+
+
+class RegisterView(Mapping):
+    """Read-only mapping of entity keys decoded lazily from a register image.
+
+    Register-backed keys are decoded on access and disappear once older than
+    the staleness limit; extra keys (cycle statistics and the like) are
+    passed through unchanged.
+    """
+
+    __slots__ = ("_image", "_extra", "_stale_after", "_intervals")
+
+    def __init__(
+        self,
+        image: RegisterImage,
+        extra: dict[str, Any],
+        stale_after: float,
+        intervals: Mapping[str, float] = KEY_INTERVALS,
+    ) -> None:
+        self._image = image
+        self._extra = extra
+        self._stale_after = stale_after
+        self._intervals = intervals
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._extra:
+            return self._extra[key]
+        spec = KEY_MAP.get(key)
+        if spec is None:
+            raise KeyError(key)
+        reg_type, address, scale, is_bool = spec
+        read_at = self._image.read_at(reg_type, address)
+        if read_at is None:
+            raise KeyError(key)
+        age = time.monotonic() - read_at
+        if age > stale_limit(key, self._stale_after, self._intervals):
+            raise KeyError(key)
+        if key in COUNTDOWN_KEYS:
+            return extrapolate_countdown(self._image.get(reg_type, address), scale, age)
+        return decode(self._image.get(reg_type, address), scale, is_bool)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._extra
+        for key in KEY_MAP:
+            if key not in self._extra and key in self:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def key_age(self, key: str) -> float | None:
+        """Return seconds since the key's register was last read, or None if never read."""
+        spec = KEY_MAP.get(key)
+        if spec is None:
+            return None
+        read_at = self._image.read_at(spec[0], spec[1])
+        if read_at is None:
+            return None
+        return time.monotonic() - read_at
+
+    def is_key_available(self, key: str) -> bool:
+        """Return False once a register-backed key is older than the staleness limit."""
+        if key not in KEY_MAP:
+            return True
+        age = self.key_age(key)
+        return age is not None and age <= stale_limit(key, self._stale_after, self._intervals)
+
+
+# -----------------------------
+# Week schedule
+# -----------------------------
+
+# Week schedule block: 7 days x 2 periods x (start hour, start minute, end hour, end minute)
+SCHEDULE_START = 5000
+SCHEDULE_DAYS: tuple[str, ...] = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+SCHEDULE_PERIODS = 2
+SCHEDULE_REGS_PER_PERIOD = 4
+SCHEDULE_COUNT = len(SCHEDULE_DAYS) * SCHEDULE_PERIODS * SCHEDULE_REGS_PER_PERIOD
+
+# Modbus limits for a single FC03/FC04 read and FC16 write
+MAX_READ_REGISTERS = 125
+MAX_WRITE_REGISTERS = 123
+
+
+def decode_schedule(registers: list[int]) -> dict[str, list[dict[str, str]]]:
+    """Decode the raw week schedule block into {day: [{"start": "HH:MM", "end": "HH:MM"}, ...]}."""
+    schedule: dict[str, list[dict[str, str]]] = {}
+    per_day = SCHEDULE_PERIODS * SCHEDULE_REGS_PER_PERIOD
+    for day_index, day in enumerate(SCHEDULE_DAYS):
+        periods = []
+        for period in range(SCHEDULE_PERIODS):
+            base = day_index * per_day + period * SCHEDULE_REGS_PER_PERIOD
+            start_h, start_m, end_h, end_m = registers[base:base + SCHEDULE_REGS_PER_PERIOD]
+            periods.append({"start": f"{start_h:02d}:{start_m:02d}", "end": f"{end_h:02d}:{end_m:02d}"})
+        schedule[day] = periods
+    return schedule
+
+
+def _parse_time(value: str) -> tuple[int, int]:
+    hours, minutes = (int(part) for part in str(value).split(":")[:2])
+    if not (0 <= hours <= 24 and 0 <= minutes <= 59):
+        raise ValueError(f"Invalid schedule time: {value}")
+    return hours, minutes
+
+
+def encode_schedule(schedule: dict[str, list[dict[str, str]]], current: list[int]) -> list[int]:
+    """Overlay the given days onto the current raw schedule block; days not given are kept."""
+    registers = list(current)
+    per_day = SCHEDULE_PERIODS * SCHEDULE_REGS_PER_PERIOD
+    for day, periods in schedule.items():
+        if day not in SCHEDULE_DAYS:
+            raise ValueError(f"Unknown schedule day: {day}")
+        if len(periods) > SCHEDULE_PERIODS:
+            raise ValueError(f"At most {SCHEDULE_PERIODS} periods per day")
+        day_index = SCHEDULE_DAYS.index(day)
+        for period in range(SCHEDULE_PERIODS):
+            entry = periods[period] if period < len(periods) else {"start": "00:00", "end": "00:00"}
+            base = day_index * per_day + period * SCHEDULE_REGS_PER_PERIOD
+            registers[base:base + SCHEDULE_REGS_PER_PERIOD] = [*_parse_time(entry["start"]), *_parse_time(entry["end"])]
+    return registers
+
+
+def coalesce_registers(
+    registers: Iterable[tuple[str, int]],
+    max_gap: int = 2,
+    max_len: int = MAX_READ_REGISTERS,
+) -> list[tuple[str, int, int]]:
+    """Return (type, start, count) reads covering every register, merging runs up to max_gap apart."""
+    ranges: list[tuple[str, int, int]] = []
+    by_type: dict[str, list[int]] = {}
+    for reg_type, address in registers:
+        by_type.setdefault(reg_type, []).append(address)
+    for reg_type, addresses in by_type.items():
+        run_start = run_end = None
+        for address in sorted(set(addresses)):
+            if run_start is not None and address - run_end - 1 <= max_gap and address - run_start < max_len:
+                run_end = address
+                continue
+            if run_start is not None:
+                ranges.append((reg_type, run_start, run_end - run_start + 1))
+            run_start = run_end = address
+        if run_start is not None:
+            ranges.append((reg_type, run_start, run_end - run_start + 1))
+    return ranges
+
+
+def changed_ranges(
+    start: int,
+    current: list[int | None],
+    desired: list[int],
+    max_gap: int = 2,
+    max_len: int = MAX_WRITE_REGISTERS,
+) -> list[tuple[int, list[int]]]:
+    """Return (address, values) FC16 ranges covering every register that differs.
+
+    Runs separated by at most max_gap unchanged registers are merged, since
+    rewriting a known value is cheaper than another transaction.
+    """
+    ranges: list[tuple[int, list[int]]] = []
+    run_start: int | None = None
+    run_end = 0
+    for offset, (old, new) in enumerate(zip(current, desired)):
+        if old == new:
+            continue
+        if run_start is not None and offset - run_end - 1 <= max_gap and offset - run_start < max_len:
+            run_end = offset
+            continue
+        if run_start is not None:
+            ranges.append((start + run_start, desired[run_start:run_end + 1]))
+        run_start = run_end = offset
+    if run_start is not None:
+        ranges.append((start + run_start, desired[run_start:run_end + 1]))
+    return ranges
+
+
+# -----------------------------
+# Alarm log
+# -----------------------------
+
+# Alarm log block, newest entry first: alarm code, state, then year, month, day, hour, minute, second
+ALARM_LOG_START = 15701
+ALARM_LOG_ENTRIES = 20
+ALARM_LOG_REGS_PER_ENTRY = 8
+# Entries fetched per request once the newest entry turns out to be new
+ALARM_LOG_READ_ENTRIES = MAX_READ_REGISTERS // ALARM_LOG_REGS_PER_ENTRY
+
+
+def decode_alarm_log_entry(registers: list[int]) -> dict[str, Any]:
+    """Decode one raw alarm log entry into code, state label and timestamp fields."""
+    code, state, year, month, day, hour, minute, second = registers[:ALARM_LOG_REGS_PER_ENTRY]
+    return {
+        "alarm_code": code,
+        "state": ALARM_STATE_MAP.get(state, str(state)),
+        "timestamp": (year, month, day, hour, minute, second),
+    }
+
+
+# -----------------------------
+# Configuration snapshot
+# -----------------------------
+
+# Commissioning settings copied between units: setpoints and switches, plus the week schedule
+CONFIG_KEYS: tuple[str, ...] = (
+    "target_temp",
+    "setpoint_eco_offset",
+    "cooling_recovery_temp",
+    "eco_modus",
+    "heater_switch",
+    "cooling_recovery",
+    "mode_summerwinter",
+)
+CONFIG_REGISTERS: tuple[int, ...] = tuple(
+    sorted({KEY_MAP[key][1] for key in CONFIG_KEYS} | set(range(SCHEDULE_START, SCHEDULE_START + SCHEDULE_COUNT)))
+)
+
+
+def plan_config_writes(snapshot: Mapping[int, int], current: Mapping[int, int | None]) -> list[tuple[int, list[int]]]:
+    """Return FC16 (address, values) ranges that bring current to snapshot.
+
+    Ranges only ever span snapshot registers: runs are split at registers
+    outside the snapshot, so no unrelated register is rewritten.
+    """
+    ranges: list[tuple[int, list[int]]] = []
+    for _, start, count in coalesce_registers((("holding", address) for address in snapshot), max_gap=0):
+        addresses = range(start, start + count)
+        ranges.extend(
+            changed_ranges(start, [current.get(address) for address in addresses], [snapshot[address] for address in addresses])
+        )
+    return ranges
+
@@ -0,0 +1,268 @@
+"""Lean native asyncio Modbus RTU transport for Systemair SAVE VSR.
+
+An optional alternative to pymodbus' AsyncModbusSerialClient. It speaks only
+the function codes the hub uses (FC03, FC04, FC06, FC16), parses responses by
+their expected length so a transaction completes as soon as the last byte
+arrives, checks that each response answers its request, and derives the
+3.5-character inter-frame gap from the line settings.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+try:
+    import serial_asyncio_fast as serial_asyncio
+except ImportError:  # pragma: no cover - depends on installed extras
+    try:
+        import serial_asyncio
+    except ImportError:
+        serial_asyncio = None
+
+_LOGGER = logging.getLogger(__name__)
+
+FC_READ_HOLDING = 0x03
+FC_READ_INPUT = 0x04
+FC_WRITE_SINGLE = 0x06
+FC_WRITE_MULTIPLE = 0x10
+
+
+def rtu_available() -> bool:
+    """Return True if an asyncio serial backend is installed."""
+    return serial_asyncio is not None
+
+
+def _build_crc_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC_TABLE: tuple[int, ...] = _build_crc_table()
+
+
+def crc16(frame: bytes | bytearray | memoryview) -> int:
+    """Return the Modbus CRC16 of a frame."""
+    crc = 0xFFFF
+    table = CRC_TABLE
+    for byte in frame:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def with_crc(pdu: bytes) -> bytes:
+    """Append the little-endian CRC to a frame."""
+    return pdu + struct.pack("<H", crc16(pdu))
+
+
+def char_time(baudrate: int, bytesize: int = 8, parity: str = "N", stopbits: int = 1) -> float:
+    """Return the time on the wire for one character in seconds."""
+    bits = 1 + bytesize + (0 if parity == "N" else 1) + stopbits
+    return bits / baudrate
+
+
+def frame_gap(baudrate: int, bytesize: int = 8, parity: str = "N", stopbits: int = 1) -> float:
+    """Return the 3.5-character silent interval, fixed at 1.75 ms above 19200 baud per the spec."""
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * char_time(baudrate, bytesize, parity, stopbits)
+
+
+class RtuResponse:
+    """Minimal response object mirroring the parts of pymodbus' API the hub uses."""
+
+    __slots__ = ("function_code", "registers", "exception_code")
+
+    def __init__(self, function_code: int, registers: list[int] | None = None, exception_code: int | None = None) -> None:
+        self.function_code = function_code
+        self.registers = registers or []
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:  # noqa: N802 - mirrors pymodbus
+        return self.exception_code is not None
+
+    def __repr__(self) -> str:
+        if self.exception_code is not None:
+            return f"RtuResponse(fc={self.function_code:#04x}, exception={self.exception_code})"
+        return f"RtuResponse(fc={self.function_code:#04x}, registers={self.registers})"
+
+
+class _RtuProtocol(asyncio.Protocol):
+    """Collect response bytes and resolve the pending transaction once the expected length arrives."""
+
+    def __init__(self, client: RtuClient) -> None:
+        self._client = client
+        self._buffer = bytearray()
+        self._expected = 0
+        self._future: asyncio.Future[bytes] | None = None
+        self.transport: asyncio.Transport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.transport = None
+        if self._future is not None and not self._future.done():
+            self._future.set_exception(ConnectionError(f"Serial connection lost: {exc}"))
+        self._client._connection_lost(self)
+
+    def expect(self, length: int) -> asyncio.Future[bytes]:
+        self._buffer.clear()
+        self._expected = length
+        self._future = asyncio.get_running_loop().create_future()
+        return self._future
+
+    def discard(self) -> None:
+        self._buffer.clear()
+        self._future = None
+
+    def data_received(self, data: bytes) -> None:
+        self._client._last_rx = asyncio.get_running_loop().time()
+        future = self._future
+        if future is None or future.done():
+            # Late bytes from a timed-out transaction; drop them
+            return
+        self._buffer += data
+        if len(self._buffer) >= 2 and self._buffer[1] & 0x80:
+            self._expected = 5
+        if len(self._buffer) >= self._expected:
+            future.set_result(bytes(self._buffer[:self._expected]))
+
+
+class RtuClient:
+    """Native asyncio Modbus RTU client with the subset of pymodbus' client API the hub relies on."""
+
+    def __init__(self, port: str, baudrate: int, bytesize: int = 8, parity: str = "N", stopbits: int = 1) -> None:
+        self._port = port
+        self._baudrate = int(baudrate)
+        self._bytesize = int(bytesize)
+        self._parity = parity
+        self._stopbits = int(stopbits)
+        self._gap = frame_gap(self._baudrate, self._bytesize, parity, self._stopbits)
+        self._protocol: _RtuProtocol | None = None
+        self._lock = asyncio.Lock()
+        self._last_rx = 0.0
+        # Set when a transaction ended without its response; late bytes may still be on the line
+        self._stale = False
+
+    @property
+    def connected(self) -> bool:
+        return self._protocol is not None and self._protocol.transport is not None
+
+    async def connect(self) -> bool:
+        """Open the serial port."""
+        if serial_asyncio is None:
+            _LOGGER.error("Native RTU transport needs pyserial-asyncio-fast or pyserial-asyncio")
+            return False
+        loop = asyncio.get_running_loop()
+        _, self._protocol = await serial_asyncio.create_serial_connection(
+            loop,
+            lambda: _RtuProtocol(self),
+            self._port,
+            baudrate=self._baudrate,
+            bytesize=self._bytesize,
+            parity=self._parity,
+            stopbits=self._stopbits,
+        )
+        return True
+
+    def close(self) -> None:
+        """Close the serial port."""
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.close()
+        self._protocol = None
+
+    def _connection_lost(self, protocol: _RtuProtocol) -> None:
+        if self._protocol is protocol:
+            self._protocol = None
+
+    async def _transact(self, request: bytes, expected: int) -> RtuResponse:
+        async with self._lock:
+            protocol = self._protocol
+            if protocol is None or protocol.transport is None:
+                raise ConnectionError("Serial port is not open")
+            loop = asyncio.get_running_loop()
+            # Keep the line silent for 3.5 characters after the previous frame; after a lost
+            # response, wait until the late bytes stop and drop whatever the port still holds
+            while (idle := self._last_rx + self._gap - loop.time()) > 0:
+                await asyncio.sleep(idle)
+                if not self._stale:
+                    break
+            if self._stale:
+                self._discard_input(protocol)
+            future = protocol.expect(expected)
+            protocol.transport.write(request)
+            self._stale = True
+            frame = await future
+            self._stale = False
+            self._last_rx = loop.time()
+
+        response = self._parse(request, frame)
+        if response.exception_code == -1:
+            # A frame that does not answer this request leaves the line in an unknown state
+            self._stale = True
+        return response
+
+    @staticmethod
+    def _discard_input(protocol: _RtuProtocol) -> None:
+        """Drop bytes left over from a transaction that timed out."""
+        serial = getattr(protocol.transport, "serial", None)
+        if serial is not None:
+            try:
+                serial.reset_input_buffer()
+            except (OSError, AttributeError) as err:
+                _LOGGER.debug("Could not flush the serial input buffer: %s", err)
+        protocol.discard()
+
+    @staticmethod
+    def _parse(request: bytes, frame: bytes) -> RtuResponse:
+        """Decode a response frame, checking that it answers the request."""
+        function = request[1]
+        if crc16(frame[:-2]) != struct.unpack("<H", frame[-2:])[0]:
+            _LOGGER.debug("CRC mismatch in response %s", frame.hex())
+            return RtuResponse(function, exception_code=-1)
+        if frame[0] != request[0]:
+            _LOGGER.debug("Response from unexpected slave %s", frame[0])
+            return RtuResponse(function, exception_code=-1)
+        if frame[1] & 0x7F != function:
+            _LOGGER.debug("Response function code %#04x does not match request %#04x", frame[1], function)
+            return RtuResponse(function, exception_code=-1)
+        if frame[1] & 0x80:
+            return RtuResponse(function, exception_code=frame[2])
+        if function in (FC_READ_HOLDING, FC_READ_INPUT):
+            count = struct.unpack(">H", request[4:6])[0]
+            if frame[2] != 2 * count:
+                _LOGGER.debug("Response byte count %s does not match %s requested registers", frame[2], count)
+                return RtuResponse(function, exception_code=-1)
+            return RtuResponse(function, list(struct.unpack(f">{count}H", frame[3:3 + 2 * count])))
+        # FC06 echoes address and value, FC16 address and quantity
+        if frame[2:6] != request[2:6]:
+            _LOGGER.debug("Write response %s does not echo request %s", frame.hex(), request.hex())
+            return RtuResponse(function, exception_code=-1)
+        return RtuResponse(function)
+
+    async def _read(self, function: int, address: int, count: int, slave: int) -> RtuResponse:
+        request = with_crc(struct.pack(">BBHH", slave, function, address, count))
+        return await self._transact(request, 5 + 2 * count)
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1) -> RtuResponse:
+        return await self._read(FC_READ_HOLDING, address, count, slave)
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1) -> RtuResponse:
+        return await self._read(FC_READ_INPUT, address, count, slave)
+
+    async def write_register(self, address: int, value: int, slave: int = 1) -> RtuResponse:
+        request = with_crc(struct.pack(">BBHH", slave, FC_WRITE_SINGLE, address, value & 0xFFFF))
+        return await self._transact(request, 8)
+
+    async def write_registers(self, address: int, values: list[int], slave: int = 1) -> RtuResponse:
+        count = len(values)
+        request = with_crc(
+            struct.pack(f">BBHHB{count}H", slave, FC_WRITE_MULTIPLE, address, count, 2 * count, *(v & 0xFFFF for v in values))
+        )
+        return await self._transact(request, 8)
@@ -1,8 +1,9 @@
 """Sensor platform for Systemair SAVE VSR (VSR500)."""
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Final
+from typing import Any, Final
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -17,11 +18,15 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfTime,
 )
+from homeassistant.core import callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .__init__ import SAVEVSRHub
+from .const import CONF_SENSOR_FILTERS, DOMAIN
+from .deadband import PublishedState, PublishFilter, sensor_value
+from .hub import SAVEVSRHub
+from .entity import SAVEVSRRefreshMixin
+from .registers import ALARM_STATE_MAP, KEY_MAP
 
 
 # -----------------------------
@@ -45,14 +50,8 @@ MODE_MAIN_MAP: Final[dict[int, str]] = {
     4: "Manual",
 }
 
-# Many Systemair alarms are 0..3 in official docs.
-# Your current hub marks a lot of them as bool (0/1). We map both:
-ALARM_STATE_MAP: Final[dict[int, str]] = {
-    0: "Inactive",
-    1: "Active",
-    2: "Waiting",
-    3: "Cleared Error Active",
-}
+# Many Systemair alarms are 0..3 in official docs (shared with the hub's alarm tracking).
+# Your current hub marks a lot of them as bool (0/1). We map both.
 
 
 # -----------------------------
@@ -64,6 +63,13 @@ class SAVEVSRSensorDescription(SensorEntityDescription):
     """Describes a Systemair SAVE VSR sensor with optional value mapping."""
     coordinator_key: str
     value_map: dict[int, str] | None = None  # raw register -> label
+    attributes_key: str | None = None  # coordinator key holding extra state attributes
+    attributes_name: str | None = None  # nest the attributes under this name instead of spreading them
+    # Publish a new value only when it moved by at least deadband (native units) or deadband_relative
+    # (fraction of the last published value), or heartbeat seconds passed; overridable per entity in the options
+    deadband: float | None = None
+    deadband_relative: float | None = None
+    heartbeat: float | None = None
 
 
 # -----------------------------
@@ -97,6 +103,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         coordinator_key="temp_outdoor",
+        deadband=0.2,
     ),
     SAVEVSRSensorDescription(
         key="vsr_temp_supply",
@@ -105,6 +112,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         coordinator_key="temp_supply",
+        deadband=0.2,
     ),
     SAVEVSRSensorDescription(
         key="vsr_temp_extract",
@@ -113,6 +121,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         coordinator_key="temp_extract",
+        deadband=0.2,
     ),
     SAVEVSRSensorDescription(
         key="vsr_temp_exhaust",
@@ -121,6 +130,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         coordinator_key="temp_exhaust",
+        deadband=0.2,
     ),
     SAVEVSRSensorDescription(
         key="vsr_temp_overheat",
@@ -129,6 +139,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         coordinator_key="temp_overheat",
+        deadband=0.2,
     ),
 
     # Pressures
@@ -138,6 +149,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfPressure.PA,
         coordinator_key="supply_air_pressure",
+        deadband=2,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
     SAVEVSRSensorDescription(
@@ -146,6 +158,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfPressure.PA,
         coordinator_key="extract_air_pressure",
+        deadband=2,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
 
@@ -174,6 +187,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
         coordinator_key="saf_rpm",
+        deadband_relative=0.02,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
     SAVEVSRSensorDescription(
@@ -182,6 +196,7 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
         coordinator_key="eaf_rpm",
+        deadband_relative=0.02,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
 
@@ -310,6 +325,47 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         coordinator_key="humidity",
     ),
+
+    # Poll cycle diagnostics (computed by the hub, not read from the unit)
+    SAVEVSRSensorDescription(
+        key="vsr_cycle_duration",
+        name="Poll Cycle Duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        coordinator_key="cycle_duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SAVEVSRSensorDescription(
+        key="vsr_cycle_overruns",
+        name="Poll Cycle Overruns",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        coordinator_key="cycle_overruns",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SAVEVSRSensorDescription(
+        key="vsr_deferred_blocks",
+        name="Deferred Register Blocks",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        coordinator_key="deferred_blocks",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SAVEVSRSensorDescription(
+        key="vsr_merged_ticks",
+        name="Merged Poll Ticks",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        coordinator_key="merged_ticks",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SAVEVSRSensorDescription(
+        key="vsr_bus_load",
+        name="Bus Load",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        coordinator_key="bus_load",
+        attributes_key="bus_estimate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
 )
 
 
@@ -318,6 +374,17 @@ SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
 # -----------------------------
 
 ALARM_SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
+    # Aggregated view of all individual alarms (computed by the hub)
+    SAVEVSRSensorDescription(
+        key="vsr_active_alarms",
+        name="Active Alarms",
+        state_class=SensorStateClass.MEASUREMENT,
+        coordinator_key="active_alarms",
+        attributes_key="active_alarm_list",
+        attributes_name="alarms",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+
     # Type A/B/C
     SAVEVSRSensorDescription(
         key="vsr_alarm_typeA",
@@ -598,6 +665,10 @@ ALARM_SENSORS: tuple[SAVEVSRSensorDescription, ...] = (
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:
     hub: SAVEVSRHub = hass.data[DOMAIN][entry.entry_id]
+    if hub.statistics is not None:
+        for desc in SENSORS:
+            if desc.state_class == SensorStateClass.MEASUREMENT and desc.coordinator_key in KEY_MAP:
+                hub.statistics.track(desc.coordinator_key, desc.name, desc.native_unit_of_measurement)
     entities: list[SAVEVSRSensor] = [
         SAVEVSRSensor(hub, desc) for desc in (*SENSORS, *ALARM_SENSORS)
     ]
@@ -608,7 +679,7 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
 # Entity
 # -----------------------------
 
-class SAVEVSRSensor(CoordinatorEntity, SensorEntity):
+class SAVEVSRSensor(SAVEVSRRefreshMixin, CoordinatorEntity, SensorEntity):
     """Representation of a SAVE VSR sensor."""
 
     _attr_has_entity_name = False  # Keep your explicit names
@@ -617,8 +688,9 @@ class SAVEVSRSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(self, hub: SAVEVSRHub, description: SAVEVSRSensorDescription) -> None:
         super().__init__(hub.coordinator)
-        self._hub = hub
+        self.hub = hub
         self.entity_description = description
+        self.refresh_keys = (description.coordinator_key,)
 
         # Keep your previous unique_id stable to avoid entity duplication
         self._attr_unique_id = description.key
@@ -633,28 +705,56 @@ class SAVEVSRSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_class = description.device_class
         self._attr_native_unit_of_measurement = description.native_unit_of_measurement
         self._attr_state_class = description.state_class
+        if hub.statistics_only and description.coordinator_key in (hub.statistics.keys if hub.statistics else ()):
+            # Long-term statistics come from the hub's hourly import instead
+            self._attr_state_class = None
         self._attr_entity_category = description.entity_category
 
-    @staticmethod
-    def _map_value(raw: object, value_map: dict[int, str] | None) -> object | None:
-        """Map raw register (int/bool) to label using value_map; tolerate bools."""
-        if raw is None or not value_map:
-            return raw
-        try:
-            if isinstance(raw, bool):
-                normalized = 1 if raw else 0
-            else:
-                normalized = int(raw)
-        except (ValueError, TypeError):
-            return raw
-        return value_map.get(normalized, raw)
+        # Noisy measurements only write a state when they move beyond their deadband
+        self._state = PublishedState(
+            PublishFilter.for_description(description, hub.entry.options.get(CONF_SENSOR_FILTERS, {}).get(description.key, {}))
+        )
+
+    @property
+    def available(self) -> bool:
+        """Keep the last good value until it is older than the staleness limit."""
+        return super().available and self.hub.is_key_available(self.entity_description.coordinator_key)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return extra attributes for descriptions that carry them."""
+        attributes_key = self.entity_description.attributes_key
+        data = self.coordinator.data
+        if attributes_key is None or data is None:
+            return None
+        attributes = data.get(attributes_key) or {}
+        attributes_name = self.entity_description.attributes_name
+        return {attributes_name: attributes} if attributes_name else dict(attributes)
 
     @property
     def native_value(self):
-        """Return the current value."""
-        data = self.coordinator.data or {}
-        raw = data.get(self.entity_description.coordinator_key)
+        """Return the last published value; deadband-filtered sensors lag small changes."""
+        return self._state.value
 
+    def _current_value(self) -> Any:
         # Apply mapping for ENUMs or any description with a value_map
-        mapped = self._map_value(raw, self.entity_description.value_map)
-        return mapped
+        return sensor_value(self.coordinator.data, self.entity_description.coordinator_key, self.entity_description.value_map)
+
+    def _publish(self) -> None:
+        self._state.publish(self._current_value(), self.available, time.monotonic())
+
+    async def async_added_to_hass(self) -> None:
+        self._publish()
+        await super().async_added_to_hass()
+
+    async def async_update(self) -> None:
+        """An explicit refresh always publishes the fresh value, deadband or not."""
+        await super().async_update()
+        self._publish()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write while the value stays inside its deadband and the heartbeat is not due."""
+        if not self._state.update(self._current_value(), self.available, time.monotonic()):
+            return
+        super()._handle_coordinator_update()
@@ -0,0 +1,204 @@
+"""Services for Systemair SAVE VSR."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .const import CONFIG_SNAPSHOT_DIR, DOMAIN
+from .engine import EngineError
+from .registers import SCHEDULE_DAYS
+
+if TYPE_CHECKING:
+    from .hub import SAVEVSRHub
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_REFRESH = "refresh"
+ATTR_SCHEDULE = "schedule"
+ATTR_NAME = "name"
+ATTR_SNAPSHOT = "snapshot"
+
+SERVICE_GET_WEEK_SCHEDULE = "get_week_schedule"
+SERVICE_SET_WEEK_SCHEDULE = "set_week_schedule"
+SERVICE_SAVE_CONFIG_SNAPSHOT = "save_config_snapshot"
+SERVICE_APPLY_CONFIG_SNAPSHOT = "apply_config_snapshot"
+
+# Snapshot names become file names in the snapshot directory; no paths
+_SNAPSHOT_NAME = vol.All(cv.string, vol.Match(r"^[A-Za-z0-9_-]+$"))
+
+_PERIOD_SCHEMA = vol.Schema({vol.Required("start"): cv.string, vol.Required("end"): cv.string})
+
+GET_WEEK_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESH, default=False): cv.boolean,
+    }
+)
+
+SET_WEEK_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_SCHEDULE): {vol.In(SCHEDULE_DAYS): vol.All(cv.ensure_list, [_PERIOD_SCHEMA])},
+    }
+)
+
+
+SAVE_CONFIG_SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_NAME): _SNAPSHOT_NAME,
+    }
+)
+
+APPLY_CONFIG_SNAPSHOT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Exclusive(ATTR_NAME, "source"): _SNAPSHOT_NAME,
+            vol.Exclusive(ATTR_SNAPSHOT, "source"): dict,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_NAME, ATTR_SNAPSHOT),
+)
+
+
+def _snapshot_path(hass: HomeAssistant, name: str) -> str:
+    return hass.config.path(CONFIG_SNAPSHOT_DIR, f"{name}.json")
+
+
+def _write_snapshot(path: str, snapshot: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(snapshot, file, indent=2)
+
+
+def _read_snapshot(path: str) -> dict:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _get_hub(hass: HomeAssistant, call: ServiceCall) -> SAVEVSRHub:
+    """Return the hub addressed by the call, defaulting to the only configured unit."""
+    return _lookup_hub(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+
+
+def _lookup_hub(hass: HomeAssistant, entry_id: str | None) -> SAVEVSRHub:
+    hubs: dict[str, SAVEVSRHub] = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        if entry_id not in hubs:
+            raise HomeAssistantError(f"Unknown Systemair SAVE VSR config entry: {entry_id}")
+        return hubs[entry_id]
+    if len(hubs) != 1:
+        raise HomeAssistantError("Specify config_entry_id when more than one unit is configured")
+    return next(iter(hubs.values()))
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_WEEK_SCHEDULE):
+        return
+
+    async def async_get_week_schedule(call: ServiceCall) -> ServiceResponse:
+        hub = _get_hub(hass, call)
+        try:
+            schedule = await hub.async_get_week_schedule(refresh=call.data[ATTR_REFRESH])
+        except EngineError as err:
+            raise HomeAssistantError(str(err)) from err
+        return {ATTR_SCHEDULE: schedule}
+
+    async def async_set_week_schedule(call: ServiceCall) -> None:
+        hub = _get_hub(hass, call)
+        try:
+            await hub.async_set_week_schedule(call.data[ATTR_SCHEDULE])
+        except (EngineError, ValueError) as err:
+            raise HomeAssistantError(str(err)) from err
+
+    async def async_save_config_snapshot(call: ServiceCall) -> ServiceResponse:
+        hub = _get_hub(hass, call)
+        try:
+            snapshot = await hub.async_read_config_snapshot()
+        except EngineError as err:
+            raise HomeAssistantError(str(err)) from err
+        if ATTR_NAME in call.data:
+            path = _snapshot_path(hass, call.data[ATTR_NAME])
+            try:
+                await hass.async_add_executor_job(_write_snapshot, path, snapshot)
+            except OSError as err:
+                raise HomeAssistantError(f"Cannot write snapshot {path}: {err}") from err
+            _LOGGER.info("Saved configuration snapshot of %s to %s", hub.entry.title, path)
+        return {ATTR_SNAPSHOT: snapshot}
+
+    async def async_apply_config_snapshot(call: ServiceCall) -> ServiceResponse:
+        if ATTR_NAME in call.data:
+            path = _snapshot_path(hass, call.data[ATTR_NAME])
+            try:
+                snapshot = await hass.async_add_executor_job(_read_snapshot, path)
+            except (OSError, ValueError) as err:
+                raise HomeAssistantError(f"Cannot read snapshot {path}: {err}") from err
+        else:
+            snapshot = call.data[ATTR_SNAPSHOT]
+        # Several units may be given to commission a fleet from one snapshot
+        hubs = [_lookup_hub(hass, entry_id) for entry_id in call.data.get(ATTR_CONFIG_ENTRY_ID) or [None]]
+        # Every unit is tried even when an earlier one fails, so one bad unit does not stall the fleet
+        results = {}
+        failed = []
+        for hub in hubs:
+            try:
+                result = await hub.async_apply_config_snapshot(snapshot)
+            except (EngineError, KeyError, TypeError, ValueError) as err:
+                _LOGGER.error("Applying snapshot to %s failed: %s", hub.entry.title, err)
+                results[hub.entry.entry_id] = {"ok": False, "error": str(err)}
+                failed.append(hub.entry.title)
+            else:
+                results[hub.entry.entry_id] = {"ok": True, **result}
+        if failed and not call.return_response:
+            # Without a response the per-unit results are lost, so report the failures instead
+            raise HomeAssistantError(f"Applying snapshot failed for {', '.join(failed)}")
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_WEEK_SCHEDULE,
+        async_get_week_schedule,
+        schema=GET_WEEK_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_WEEK_SCHEDULE, async_set_week_schedule, schema=SET_WEEK_SCHEDULE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAVE_CONFIG_SNAPSHOT,
+        async_save_config_snapshot,
+        schema=SAVE_CONFIG_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_CONFIG_SNAPSHOT,
+        async_apply_config_snapshot,
+        schema=APPLY_CONFIG_SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove integration services when the last unit is unloaded."""
+    for service in (
+        SERVICE_GET_WEEK_SCHEDULE,
+        SERVICE_SET_WEEK_SCHEDULE,
+        SERVICE_SAVE_CONFIG_SNAPSHOT,
+        SERVICE_APPLY_CONFIG_SNAPSHOT,
+    ):
+        hass.services.async_remove(DOMAIN, service)
@@ -0,0 +1,167 @@
+"""Simulated SAVE VSR Modbus slave with fault injection.
+
+SimulatedClient implements the subset of the Modbus client API the engine
+uses, backed by an in-memory SimulatedUnit instead of a serial port. Faults
+seen in the field (latency, CRC garbage, dropped responses, a vanishing
+serial adapter, exception responses for unsupported registers) are injected
+according to a FaultProfile.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+
+from .registers import REGISTER_BATCHES, SCHEDULE_COUNT, SCHEDULE_START
+from .rtu import RtuResponse
+
+# Modbus exception codes
+ILLEGAL_DATA_ADDRESS = 2
+# Marker used for responses that failed the CRC check
+CRC_ERROR = -1
+
+
+@dataclass
+class FaultProfile:
+    """Fault injection settings for a simulated unit."""
+
+    latency: float = 0.0  # added to every transaction, seconds
+    jitter: float = 0.0  # uniform extra latency, seconds
+    crc_error_rate: float = 0.0  # fraction of responses that arrive garbled
+    drop_rate: float = 0.0  # fraction of requests that never get a response
+    unsupported: frozenset[int] = frozenset()  # addresses answered with an exception response
+    outages: list[tuple[float, float]] = field(default_factory=list)  # (start, duration) of adapter loss, seconds from start
+    seed: int | None = None
+
+
+class SimulatedUnit:
+    """In-memory register set that drifts like a running unit."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        self._random = random.Random(seed)
+        self.holding: dict[int, int] = {}
+        self.input: dict[int, int] = {}
+        # Monotonic time each register last changed, used to tell real changes from false ones
+        self.changed_at: dict[tuple[str, int], float] = {}
+        for batch in REGISTER_BATCHES:
+            space = self.holding if batch["type"] == "holding" else self.input
+            for offset in range(batch["count"]):
+                space.setdefault(batch["start"] + offset, 0)
+        for offset in range(SCHEDULE_COUNT):
+            self.holding.setdefault(SCHEDULE_START + offset, 0)
+        self.holding.update({
+            1130: 2, 2000: 210, 1350: 1, 1110: 0, 7005: 60000,
+            12101: 50, 12102: 190, 12105: 80, 12542: 215, 12107: 200,
+            12400: 1500, 12401: 1450, 14000: 40, 14001: 40, 14002: 40, 12203: 80,
+        })
+        self.input.update({1160: 1, 12102: 190})
+        self._last_tick = time.monotonic()
+
+    def _set(self, reg_type: str, address: int, value: int) -> None:
+        space = self.holding if reg_type == "holding" else self.input
+        value &= 0xFFFF
+        if space.get(address) != value:
+            space[address] = value
+            self.changed_at[(reg_type, address)] = time.monotonic()
+
+    def tick(self) -> None:
+        """Advance the simulation: temperatures drift, fans jitter, countdowns run down."""
+        now = time.monotonic()
+        elapsed = int(now - self._last_tick)
+        if elapsed < 1:
+            return
+        self._last_tick += elapsed
+        rnd = self._random
+        for address in (12101, 12105, 12542):
+            if rnd.random() < 0.2:
+                self._set("holding", address, self.holding[address] + rnd.choice((-1, 1)))
+        for address in (12400, 12401):
+            if rnd.random() < 0.5:
+                self._set("holding", address, self.holding[address] + rnd.randint(-10, 10))
+        for address in (1110, 7005):
+            if self.holding[address]:
+                self._set("holding", address, max(0, self.holding[address] - elapsed))
+
+    def read(self, reg_type: str, address: int, count: int) -> list[int]:
+        space = self.holding if reg_type == "holding" else self.input
+        return [space.get(address + offset, 0) for offset in range(count)]
+
+    def write(self, address: int, values: list[int]) -> None:
+        for offset, value in enumerate(values):
+            self._set("holding", address + offset, value)
+
+
+class SimulatedClient:
+    """Modbus client backed by a SimulatedUnit and a FaultProfile."""
+
+    def __init__(self, unit: SimulatedUnit, faults: FaultProfile | None = None) -> None:
+        self.unit = unit
+        self.faults = faults or FaultProfile()
+        self._random = random.Random(self.faults.seed)
+        self._started = time.monotonic()
+        self._connected = False
+        self.transactions = 0
+        self.injected: dict[str, int] = {"crc": 0, "drop": 0, "exception": 0, "outage": 0}
+
+    def adapter_present(self) -> bool:
+        """Return False while an injected outage is in progress."""
+        elapsed = time.monotonic() - self._started
+        return not any(start <= elapsed < start + duration for start, duration in self.faults.outages)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected and self.adapter_present()
+
+    async def connect(self) -> bool:
+        if not self.adapter_present():
+            self.injected["outage"] += 1
+            return False
+        self._connected = True
+        return True
+
+    def close(self) -> None:
+        self._connected = False
+
+    async def _transact(self, function: int, addresses: range) -> RtuResponse | None:
+        """Apply latency and faults; return an error response, or None to proceed."""
+        faults = self.faults
+        self.transactions += 1
+        if not self.adapter_present():
+            self._connected = False
+            self.injected["outage"] += 1
+            raise ConnectionError("Serial adapter disappeared")
+        delay = faults.latency + (self._random.uniform(0, faults.jitter) if faults.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if faults.drop_rate and self._random.random() < faults.drop_rate:
+            self.injected["drop"] += 1
+            await asyncio.Event().wait()  # never answers; the caller's timeout fires
+        if faults.crc_error_rate and self._random.random() < faults.crc_error_rate:
+            self.injected["crc"] += 1
+            return RtuResponse(function, exception_code=CRC_ERROR)
+        if faults.unsupported and any(address in faults.unsupported for address in addresses):
+            self.injected["exception"] += 1
+            return RtuResponse(function, exception_code=ILLEGAL_DATA_ADDRESS)
+        self.unit.tick()
+        return None
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1) -> RtuResponse:
+        error = await self._transact(0x03, range(address, address + count))
+        return error or RtuResponse(0x03, self.unit.read("holding", address, count))
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1) -> RtuResponse:
+        error = await self._transact(0x04, range(address, address + count))
+        return error or RtuResponse(0x04, self.unit.read("input", address, count))
+
+    async def write_register(self, address: int, value: int, slave: int = 1) -> RtuResponse:
+        error = await self._transact(0x06, range(address, address + 1))
+        if error is None:
+            self.unit.write(address, [value])
+        return error or RtuResponse(0x06)
+
+    async def write_registers(self, address: int, values: list[int], slave: int = 1) -> RtuResponse:
+        error = await self._transact(0x10, range(address, address + len(values)))
+        if error is None:
+            self.unit.write(address, list(values))
+        return error or RtuResponse(0x10)
@@ -0,0 +1,239 @@
+"""Fault-injection soak harness for the SAVE VSR poll engine.
+
+Drives SAVEVSREngine against a SimulatedClient for a fixed duration and
+reports recovery time after outages, lost cycles, false entity state changes
+and resource use. Thresholds, or a report saved from an earlier run with the
+same seed, turn the report into a pass/fail regression check (exit status 1
+when any is exceeded).
+
+    python -m custom_components.systemair_save_vsr.soak --duration 600 \\
+        --drop-rate 0.02 --crc-rate 0.02 --outage 120:60 --max-recovery 30
+    python -m custom_components.systemair_save_vsr.soak --seed 1 --json baseline.json
+    python -m custom_components.systemair_save_vsr.soak --seed 1 --compare baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+
+from .const import DEFAULT_STALE_AFTER_SECONDS
+from .engine import EngineError, SAVEVSREngine
+from .registers import COUNTDOWN_KEYS, KEY_MAP
+from .simulator import FaultProfile, SimulatedClient, SimulatedUnit
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SoakReport:
+    """Aggregated results of one soak run."""
+
+    duration: float = 0.0
+    cycles: int = 0
+    cycles_lost: int = 0
+    false_changes: int = 0
+    recovery_times: list[float] = field(default_factory=list)
+    max_recovery: float | None = None
+    max_cycle_duration: float = 0.0
+    overruns: int = 0
+    deferred_blocks: int = 0
+    transactions: int = 0
+    injected: dict[str, int] = field(default_factory=dict)
+    cpu_seconds: float = 0.0
+    cpu_percent: float = 0.0
+    memory_current_kb: float = 0.0
+    memory_peak_kb: float = 0.0
+    memory_growth_kb: float = 0.0
+    max_rss_kb: int = 0
+    violations: list[str] = field(default_factory=list)
+
+
+async def run_soak(
+    duration: float,
+    interval: float,
+    faults: FaultProfile,
+    stale_after: float = DEFAULT_STALE_AFTER_SECONDS,
+) -> SoakReport:
+    """Poll a simulated unit for duration seconds and collect stability metrics."""
+    unit = SimulatedUnit(seed=faults.seed)
+    client = SimulatedClient(unit, faults)
+    engine = SAVEVSREngine(lambda: client, stale_after)
+    report = SoakReport()
+
+    # Keys backed by registers the unit answers with an exception can never become available
+    expected_keys = [key for key, spec in KEY_MAP.items() if spec[1] not in faults.unsupported]
+    published: dict[str, object] = {}
+    published_at: dict[str, float] = {}
+    outage_started: float | None = None
+    memory_baseline: int | None = None
+
+    tracemalloc.start()
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    try:
+        while time.monotonic() - started < duration:
+            tick = time.monotonic()
+            try:
+                view = await engine.poll()
+            except EngineError as err:
+                # A failed cycle is a lost cycle, not the end of the run
+                _LOGGER.debug("Cycle %s failed: %s", report.cycles + 1, err)
+                view = engine.snapshot(online=False)
+            report.cycles += 1
+            stats = view.get("cycle_duration") or 0.0
+            report.max_cycle_duration = max(report.max_cycle_duration, stats)
+
+            complete = view.get("online") and all(view.is_key_available(key) for key in expected_keys)
+            if not complete:
+                report.cycles_lost += 1
+                if outage_started is None:
+                    outage_started = tick
+            elif outage_started is not None:
+                # Recovery is measured from the first incomplete cycle to the first complete one
+                report.recovery_times.append(round(time.monotonic() - outage_started, 3))
+                outage_started = None
+
+            # A published change is false when the unit's register did not change since we last
+            # published it; dropping to unavailable only counts while the unit was reachable.
+            reachable = client.adapter_present()
+            for key, (reg_type, address, _, _) in KEY_MAP.items():
+                value = view.get(key)
+                previous = published.get(key)
+                if previous is not None and value != previous and key not in COUNTDOWN_KEYS:
+                    changed_at = unit.changed_at.get((reg_type, address), 0.0)
+                    if (value is None and reachable) or (value is not None and changed_at <= published_at[key]):
+                        report.false_changes += 1
+                        _LOGGER.debug("False change on %s: %s -> %s", key, previous, value)
+                if value != previous:
+                    published[key] = value
+                    published_at[key] = tick
+
+            if memory_baseline is None and report.cycles == 10:
+                memory_baseline = tracemalloc.get_traced_memory()[0]
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - tick)))
+    finally:
+        await engine.close()
+
+    wall = time.monotonic() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    report.duration = round(wall, 3)
+    report.cpu_seconds = round(time.process_time() - cpu_started, 3)
+    report.cpu_percent = round(100 * report.cpu_seconds / wall, 2) if wall else 0.0
+    report.memory_current_kb = round(current / 1024, 1)
+    report.memory_peak_kb = round(peak / 1024, 1)
+    report.memory_growth_kb = round((current - (memory_baseline or current)) / 1024, 1)
+    report.max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report.max_recovery = max(report.recovery_times) if report.recovery_times else None
+    report.overruns = engine.cycle_stats["cycle_overruns"]
+    report.deferred_blocks = engine.cycle_stats["deferred_blocks"]
+    report.transactions = client.transactions
+    report.injected = dict(client.injected)
+    if outage_started is not None:
+        report.violations.append("unit did not recover before the end of the run")
+    return report
+
+
+def check_thresholds(report: SoakReport, thresholds: dict[str, float]) -> list[str]:
+    """Return a message for every threshold the report exceeds."""
+    values = {
+        "max_recovery": report.max_recovery or 0.0,
+        "max_cycles_lost": report.cycles_lost,
+        "max_false_changes": report.false_changes,
+        "max_memory_growth_kb": report.memory_growth_kb,
+        "max_cpu_percent": report.cpu_percent,
+        "max_cycle_duration": report.max_cycle_duration,
+    }
+    return [
+        f"{name}: {values[name]} > {limit}"
+        for name, limit in thresholds.items()
+        if limit is not None and values[name] > limit
+    ]
+
+
+# Report fields compared against a baseline run; resource use is too noisy to compare by ratio
+BASELINE_METRICS = ("max_recovery", "cycles_lost", "false_changes", "max_cycle_duration")
+
+
+def compare_baseline(report: SoakReport, baseline: dict, max_ratio: float) -> list[str]:
+    """Return a message for every metric that got worse than the baseline by more than max_ratio."""
+    regressions = []
+    for name in BASELINE_METRICS:
+        value, base = getattr(report, name) or 0, baseline.get(name) or 0
+        if value > base * max_ratio:
+            regressions.append(f"{name}: {value} > baseline {base}")
+    return regressions
+
+
+def _parse_outage(value: str) -> tuple[float, float]:
+    start, _, length = value.partition(":")
+    return float(start), float(length)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak-test the SAVE VSR poll engine against a faulty simulated unit.")
+    parser.add_argument("--duration", type=float, default=300.0, help="run time in seconds")
+    parser.add_argument("--interval", type=float, default=5.0, help="poll interval in seconds")
+    parser.add_argument("--stale-after", type=float, default=DEFAULT_STALE_AFTER_SECONDS)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--crc-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--unsupported", type=int, action="append", default=[], help="address answered with an exception")
+    parser.add_argument("--outage", type=_parse_outage, action="append", default=[], help="START:SECONDS adapter loss")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-recovery", type=float)
+    parser.add_argument("--max-cycles-lost", type=int)
+    parser.add_argument("--max-false-changes", type=int)
+    parser.add_argument("--max-memory-growth-kb", type=float)
+    parser.add_argument("--max-cpu-percent", type=float)
+    parser.add_argument("--max-cycle-duration", type=float)
+    parser.add_argument("--json", dest="json_path", help="write the report to this file")
+    parser.add_argument("--compare", help="compare against a report written by an earlier --json run")
+    parser.add_argument("--max-ratio", type=float, default=1.25, help="allowed worsening against the baseline")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+    faults = FaultProfile(
+        latency=args.latency,
+        jitter=args.jitter,
+        crc_error_rate=args.crc_rate,
+        drop_rate=args.drop_rate,
+        unsupported=frozenset(args.unsupported),
+        outages=args.outage,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_soak(args.duration, args.interval, faults, args.stale_after))
+    report.violations += check_thresholds(
+        report,
+        {
+            "max_recovery": args.max_recovery,
+            "max_cycles_lost": args.max_cycles_lost,
+            "max_false_changes": args.max_false_changes,
+            "max_memory_growth_kb": args.max_memory_growth_kb,
+            "max_cpu_percent": args.max_cpu_percent,
+            "max_cycle_duration": args.max_cycle_duration,
+        },
+    )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            report.violations += compare_baseline(report, json.load(file), args.max_ratio)
+
+    output = json.dumps(asdict(report), indent=2)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+    return 1 if report.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, SLAVE_ID
-from .__init__ import SAVEVSRHub
+from .hub import SAVEVSRHub
+from .entity import SAVEVSRRefreshMixin
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -22,7 +23,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities(entities)
 
 
-class SAVEVSRSwitch(CoordinatorEntity, SwitchEntity):
+class SAVEVSRSwitch(SAVEVSRRefreshMixin, CoordinatorEntity, SwitchEntity):
     """SAVE VSR switch using Modbus writes."""
 
     _attr_device_class = SwitchDeviceClass.SWITCH
@@ -45,13 +46,19 @@ class SAVEVSRSwitch(CoordinatorEntity, SwitchEntity):
         self._command_on = command_on
         self._command_off = command_off
         self._verify_key = verify_key
+        self.refresh_keys = (verify_key,)
         self._attr_device_info = hub.device_info
 
+    @property
+    def available(self) -> bool:
+        """Return False once the verify register has gone stale."""
+        return super().available and self.hub.is_key_available(self._verify_key)
+
     @property
     def is_on(self) -> bool | None:
         """Return the current state of the switch from the coordinator data."""
         data = self.coordinator.data
-        if not data:
+        if data is None:
             return None
         return bool(data.get(self._verify_key, False))
 
@@ -0,0 +1,51 @@
+"""The poll engine and its tools must import and run without Home Assistant."""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.systemair_save_vsr"
+
+# Make any homeassistant import fail, even where Home Assistant happens to be installed
+_BLOCK_HA = "import sys; sys.modules['homeassistant'] = None; "
+
+
+def _run(tmp_path: Path, code: str) -> subprocess.CompletedProcess:
+    components = tmp_path / "custom_components"
+    components.mkdir()
+    (components / "systemair_save_vsr").symlink_to(PACKAGE_ROOT, target_is_directory=True)
+    env = {**os.environ, "PYTHONPATH": str(tmp_path), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, "-c", _BLOCK_HA + code], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+def test_tools_import_without_home_assistant(tmp_path: Path) -> None:
+    result = _run(
+        tmp_path,
+        "import importlib; "
+        f"[importlib.import_module('{PACKAGE}.' + name) for name in ('engine', 'profiler', 'soak', 'bench')]",
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_profiler_runs_without_home_assistant(tmp_path: Path) -> None:
+    result = _run(
+        tmp_path,
+        f"from {PACKAGE}.profiler import main; raise SystemExit(main(['--cycles', '2', '--interval', '0', '--seed', '1']))",
+    )
+    assert result.returncode == 0, result.stderr
+    assert '"cycles": 2' in result.stdout
+
+
+def test_bench_fan_out_runs_without_home_assistant(tmp_path: Path) -> None:
+    result = _run(
+        tmp_path,
+        f"from {PACKAGE}.bench import main; "
+        "raise SystemExit(main(['--bench', 'entity_fan_out', '--units', '1', '--rounds', '2', '--min-time', '0.001']))",
+    )
+    assert result.returncode == 0, result.stderr
+    assert '"entity_fan_out"' in result.stdout
@@ -0,0 +1,210 @@
+"""Sampled span tracing for Systemair SAVE VSR.
+
+A sampled poll cycle (or a write, gateway read or on-demand refresh outside
+a cycle) becomes a trace: the root span plus child spans for bus waits,
+Modbus transactions and their individual attempts, decoding and the entity
+fan-out. The current span travels in a context variable, so code deep in
+the engine opens child spans without being handed a tracer, and costs one
+context lookup when the trace is not sampled.
+
+Finished traces are appended to a rotating JSONL file, one OTLP/JSON
+ExportTraceServiceRequest per line, the format OpenTelemetry's file
+exporter writes and its otlpjsonfile receiver reads.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar, Token
+from logging.handlers import RotatingFileHandler
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+_CURRENT: ContextVar[Span | None] = ContextVar("save_vsr_span", default=None)
+
+SCOPE_NAME = "systemair_save_vsr"
+
+
+class Span:
+    """One timed operation in a sampled trace; a context manager that makes itself current."""
+
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "start", "end", "attributes", "error", "_token")
+
+    def __init__(self, tracer: Tracer, trace_id: str, parent_id: str | None, name: str, attributes: dict) -> None:
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time_ns()
+        self.end = 0
+        self.attributes = attributes
+        self.error: str | None = None
+        self._token: Token | None = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def fail(self, message: str) -> None:
+        """Mark the span's status as an error."""
+        self.error = message
+
+    def child(self, name: str, **attributes: Any) -> Span:
+        return Span(self.tracer, self.trace_id, self.span_id, name, attributes)
+
+    def __enter__(self) -> Span:
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(self, exc_type: type | None, exc: BaseException | None, tb: Any) -> None:
+        if exc is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _CURRENT.reset(self._token)
+        self.finish()
+
+    def finish(self, end: int | None = None) -> None:
+        self.end = end or time.time_ns()
+        self.tracer.finished(self)
+
+    def as_otlp(self) -> dict[str, Any]:
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Stand-in for spans of unsampled traces."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def fail(self, message: str) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type: type | None, exc: BaseException | None, tb: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """Open a child of the current span, or a no-op span when no sampled trace is running."""
+    parent = _CURRENT.get()
+    if parent is None:
+        return NOOP_SPAN
+    return parent.child(name, **attributes)
+
+
+def current_span() -> Span | None:
+    return _CURRENT.get()
+
+
+class Tracer:
+    """Sample traces and append finished ones to a rotating JSONL file.
+
+    A disabled tracer (sample rate 0 or no path) never samples, so the
+    engine can always call trace() and span() unconditionally.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        sample_rate: float = 0.0,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        resource: dict[str, Any] | None = None,
+    ) -> None:
+        self.sample_rate = sample_rate if path else 0.0
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._resource = {
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in {"service.name": SCOPE_NAME, **(resource or {})}.items()
+            ]
+        }
+        self._handler: RotatingFileHandler | None = None
+        self._open: dict[str, list[Span]] = {}  # trace_id -> finished spans of a running trace
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def trace(self, name: str, **attributes: Any) -> Span | _NoopSpan:
+        """Open a span: a child of the current one, or the root of a new trace if this one is sampled."""
+        parent = _CURRENT.get()
+        if parent is not None:
+            return parent.child(name, **attributes)
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        root = Span(self, os.urandom(16).hex(), None, name, attributes)
+        self._open[root.trace_id] = []
+        return root
+
+    def finished(self, span: Span) -> None:
+        """Collect a finished span; the whole trace is written once its root finishes."""
+        spans = self._open.get(span.trace_id)
+        if spans is None:
+            # Spans finishing after their root (e.g. the entity fan-out) are written on their own
+            self.export([span])
+            return
+        spans.append(span)
+        if span.parent_id is None:
+            del self._open[span.trace_id]
+            self.export(spans)
+
+    def export(self, spans: list[Span]) -> None:
+        """Append spans as one OTLP/JSON line; does blocking file I/O, so keep it off the HA loop."""
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [item.as_otlp() for item in spans]}],
+                }
+            ]
+        }
+        try:
+            if self._handler is None:
+                self._handler = RotatingFileHandler(
+                    self.path, maxBytes=self._max_bytes, backupCount=self._backup_count, encoding="utf-8"
+                )
+            self._handler.emit(logging.makeLogRecord({"msg": json.dumps(request, separators=(",", ":"))}))
+        except OSError as err:
+            _LOGGER.warning("Cannot write trace file %s, tracing disabled: %s", self.path, err)
+            self.sample_rate = 0.0
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
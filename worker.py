@@ -0,0 +1,122 @@
+"""Dedicated Modbus I/O worker for Systemair SAVE VSR."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from .const import WORKER_STOP_TIMEOUT_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class ModbusWorker:
+    """Run Modbus transport and decoding on a private thread with its own event loop.
+
+    Serial framing, CRC checks, retry sleeps and decoding never run on the
+    caller's loop; each result is handed back with a single thread-safe
+    future callback.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped: asyncio.Future[None] | None = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        """Return the worker event loop, or None when not running."""
+        return self._loop
+
+    @property
+    def in_worker(self) -> bool:
+        """Return True when called from the worker thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    async def start(self) -> None:
+        """Start the worker thread and wait until its loop is running, without blocking the calling loop."""
+        if self._thread is not None:
+            return
+        caller = asyncio.get_running_loop()
+        started: asyncio.Future[None] = caller.create_future()
+        self._stopped = caller.create_future()
+        self._thread = threading.Thread(
+            target=self._run, args=(caller, started, self._stopped), name=self._name, daemon=True
+        )
+        self._thread.start()
+        await started
+
+    def _run(
+        self, caller: asyncio.AbstractEventLoop, started: asyncio.Future[None], stopped: asyncio.Future[None]
+    ) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        loop.call_soon(_resolve_threadsafe, caller, started)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+                _LOGGER.debug("Modbus worker %s stopped", self._name)
+                _resolve_threadsafe(caller, stopped)
+
+    async def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Run a coroutine on the worker loop and await its result from the calling loop."""
+        loop = self._loop
+        if loop is None:
+            coro.close()
+            raise RuntimeError("Modbus worker is not running")
+        if self.in_worker:
+            return await coro
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return await asyncio.wrap_future(future)
+
+    async def stop(self) -> None:
+        """Stop the worker loop and wait for its thread to exit, without blocking the calling loop."""
+        loop, stopped = self._loop, self._stopped
+        if loop is None or stopped is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+        except RuntimeError:
+            # The loop is already closed
+            pass
+        try:
+            await asyncio.wait_for(asyncio.shield(stopped), WORKER_STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Modbus worker %s did not stop within %ss", self._name, WORKER_STOP_TIMEOUT_SECONDS)
+        self._loop = None
+        self._thread = None
+        self._stopped = None
+
+    async def _shutdown(self) -> None:
+        """Cancel the tasks still pending on the worker loop, let them unwind there, then stop it."""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Modbus worker %s task failed while stopping: %r", self._name, result)
+        asyncio.get_running_loop().stop()
+
+
+def _resolve_threadsafe(loop: asyncio.AbstractEventLoop, future: asyncio.Future[None]) -> None:
+    """Resolve a future owned by another thread's loop, unless that loop is already gone."""
+    try:
+        loop.call_soon_threadsafe(_resolve, future)
+    except RuntimeError:
+        pass
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)